@@ -6,29 +6,77 @@ import logging
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN, PLATFORMS
+from .broker import ConnectionBroker
+from .const import (
+    CONNECTION_SLOTS,
+    DATA_BROKER,
+    DATA_REGISTERS,
+    DATA_SNAPSHOTS,
+    DOMAIN,
+    PLATFORMS,
+    STANDBY_SLICE,
+)
 from .coordinator import NordkappHeaterCoordinator
+from .registers import RegisterCache
+from .services import async_setup_services
+from .snapshots import SnapshotStore
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 type NordkappHeaterConfigEntry = ConfigEntry[NordkappHeaterCoordinator]
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Nordkapp Heater services."""
+    async_setup_services(hass)
+    return True
+
+
 async def async_setup_entry(
     hass: HomeAssistant, entry: NordkappHeaterConfigEntry
 ) -> bool:
     """Set up Nordkapp Heater from a config entry."""
+    if (broker := hass.data.get(DATA_BROKER)) is None:
+        broker = hass.data[DATA_BROKER] = ConnectionBroker(
+            hass, CONNECTION_SLOTS, STANDBY_SLICE
+        )
+    if (register_cache := hass.data.get(DATA_REGISTERS)) is None:
+        register_cache = hass.data[DATA_REGISTERS] = RegisterCache(hass)
+        await register_cache.async_load()
+    if (snapshots := hass.data.get(DATA_SNAPSHOTS)) is None:
+        snapshots = hass.data[DATA_SNAPSHOTS] = SnapshotStore(hass)
+        await snapshots.async_load()
     coordinator = NordkappHeaterCoordinator(
-        hass, entry.data["address"], entry
+        hass,
+        entry.data["address"],
+        entry,
+        broker,
+        register_cache=register_cache,
+        snapshots=snapshots,
     )
-    await coordinator.async_config_entry_first_refresh()
+    entry.async_on_unload(broker.async_register(coordinator))
+    # No first refresh: entities start from the last known state and the
+    # heater is connected in the background
+    entry.async_on_unload(coordinator.async_start())
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
     return True
 
 
+async def _async_update_listener(
+    hass: HomeAssistant, entry: NordkappHeaterConfigEntry
+) -> None:
+    """Reload the entry when options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(
     hass: HomeAssistant, entry: NordkappHeaterConfigEntry
 ) -> bool:
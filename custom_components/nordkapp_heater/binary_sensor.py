@@ -11,18 +11,24 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, RUNNING_STATES
-from .coordinator import NordkappHeaterCoordinator, NordkappHeaterData
+from .coordinator import (
+    NordkappHeaterCoordinator,
+    NordkappHeaterData,
+    field_context,
+)
 
 
 @dataclass(frozen=True, kw_only=True)
 class NordkappBinarySensorDescription(BinarySensorEntityDescription):
     value_fn: Callable[[NordkappHeaterData], bool]
+    data_fields: tuple[str, ...]
 
 
 BINARY_SENSORS: tuple[NordkappBinarySensorDescription, ...] = (
@@ -31,30 +37,43 @@ BINARY_SENSORS: tuple[NordkappBinarySensorDescription, ...] = (
         translation_key="running",
         device_class=BinarySensorDeviceClass.RUNNING,
         value_fn=lambda d: d.machine_status in RUNNING_STATES,
+        data_fields=("machine_status",),
     ),
     NordkappBinarySensorDescription(
         key="error",
         translation_key="error_active",
         device_class=BinarySensorDeviceClass.PROBLEM,
         value_fn=lambda d: d.error_code != 0,
+        data_fields=("error_code",),
     ),
     NordkappBinarySensorDescription(
         key="glow_plug",
         translation_key="glow_plug",
         icon="mdi:lightning-bolt",
         value_fn=lambda d: d.glow_plug_active,
+        data_fields=("glow_plug_active",),
     ),
     NordkappBinarySensorDescription(
         key="pump",
         translation_key="pump_active",
         icon="mdi:pump",
         value_fn=lambda d: d.pump_active,
+        data_fields=("pump_active",),
     ),
     NordkappBinarySensorDescription(
         key="fan",
         translation_key="fan_active",
         icon="mdi:fan",
         value_fn=lambda d: d.fan_active,
+        data_fields=("fan_active",),
+    ),
+    NordkappBinarySensorDescription(
+        key="stale",
+        translation_key="stale",
+        icon="mdi:history",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda d: d.stale,
+        data_fields=("stale",),
     ),
 )
 
@@ -83,7 +102,7 @@ class NordkappHeaterBinarySensor(
         entry: ConfigEntry,
         description: NordkappBinarySensorDescription,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, field_context(*description.data_fields))
         self.entity_description = description
         self._attr_unique_id = f"{entry.data['address']}_{description.key}"
         self._attr_device_info = DeviceInfo(
@@ -0,0 +1,176 @@
+"""Shared BLE connection slot broker for Nordkapp Heater."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .metrics import LatencyStats
+
+if TYPE_CHECKING:
+    from .coordinator import NordkappHeaterCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Waiter priorities, lower is served first
+PRIORITY_COMMAND = 0
+PRIORITY_RUNNING = 1
+PRIORITY_STANDBY = 2
+
+
+class ConnectionBroker:
+    """Share a limited number of BLE connection slots between heaters.
+
+    Running heaters keep their slot while connected. Heaters in standby
+    are asked to disconnect once they have held a slot for the standby
+    time slice and another heater is waiting. A command write preempts a
+    standby holder right away, so it waits at most one disconnect.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, slots: int, standby_slice: float
+    ) -> None:
+        self._hass = hass
+        self._slots = slots
+        self._standby_slice = standby_slice
+        self._coordinators: set[NordkappHeaterCoordinator] = set()
+        self._holders: dict[NordkappHeaterCoordinator, float] = {}
+        self._waiters: list[
+            tuple[int, int, NordkappHeaterCoordinator, asyncio.Future[None]]
+        ] = []
+        self._seq = itertools.count()
+        self._unsub_rotate: CALLBACK_TYPE | None = None
+        self.wait_time = LatencyStats()
+        self.preemptions = 0
+
+    @callback
+    def async_register(
+        self, coordinator: NordkappHeaterCoordinator
+    ) -> CALLBACK_TYPE:
+        """Register a heater, return a callback that unregisters it."""
+        self._coordinators.add(coordinator)
+        if self._unsub_rotate is None:
+            self._unsub_rotate = async_track_time_interval(
+                self._hass,
+                self._async_rotate,
+                timedelta(seconds=self._standby_slice / 2),
+            )
+
+        @callback
+        def _unregister() -> None:
+            self._coordinators.discard(coordinator)
+            self.release(coordinator)
+            if not self._coordinators and self._unsub_rotate is not None:
+                self._unsub_rotate()
+                self._unsub_rotate = None
+
+        return _unregister
+
+    async def async_acquire(
+        self,
+        coordinator: NordkappHeaterCoordinator,
+        priority: int,
+        timeout: float,
+    ) -> None:
+        """Wait for a connection slot, raise TimeoutError after timeout."""
+        if coordinator in self._holders:
+            return
+        if len(self._holders) < self._slots and not self._waiters:
+            self._grant(coordinator)
+            return
+
+        started = time.monotonic()
+        future: asyncio.Future[None] = self._hass.loop.create_future()
+        heapq.heappush(
+            self._waiters, (priority, next(self._seq), coordinator, future)
+        )
+        if priority == PRIORITY_COMMAND:
+            self._preempt()
+        try:
+            async with asyncio.timeout(timeout):
+                await future
+        except BaseException:
+            if future.done() and not future.cancelled():
+                # Granted while timing out, hand the slot on
+                self.release(coordinator)
+            else:
+                future.cancel()
+            raise
+        self.wait_time.add(time.monotonic() - started)
+
+    @callback
+    def release(self, coordinator: NordkappHeaterCoordinator) -> None:
+        """Return a slot and hand it to the next waiter."""
+        if self._holders.pop(coordinator, None) is not None:
+            self._grant_waiters()
+
+    @callback
+    def _grant(self, coordinator: NordkappHeaterCoordinator) -> None:
+        """Hand a free slot to a heater, waking all its waiters."""
+        self._holders[coordinator] = time.monotonic()
+        for _priority, _seq, waiter, future in self._waiters:
+            if waiter is coordinator and not future.done():
+                future.set_result(None)
+
+    @callback
+    def _grant_waiters(self) -> None:
+        """Fill free slots from the waiter queue, best priority first."""
+        while self._waiters and len(self._holders) < self._slots:
+            _priority, _seq, coordinator, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                self._grant(coordinator)
+
+    @callback
+    def _preempt(self, min_held: float = 0.0) -> None:
+        """Ask standby holders to give up slots for waiting heaters."""
+        now = time.monotonic()
+        free = self._slots - len(self._holders)
+        waiting = sum(1 for waiter in self._waiters if not waiter[3].done())
+        candidates = sorted(
+            (
+                (granted, coordinator)
+                for coordinator, granted in self._holders.items()
+                if coordinator.slot_preemptible and now - granted >= min_held
+            ),
+            key=lambda item: item[0],
+        )
+        for _granted, coordinator in candidates[: max(0, waiting - free)]:
+            _LOGGER.debug(
+                "Reclaiming connection slot from %s", coordinator.address
+            )
+            self.preemptions += 1
+            coordinator.async_release_slot()
+
+    @callback
+    def _async_rotate(self, _now: datetime) -> None:
+        """Rotate slots held by standby heaters past their time slice."""
+        if self._waiters:
+            self._preempt(self._standby_slice)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return slot occupancy and wait times for diagnostics."""
+        now = time.monotonic()
+        return {
+            "slots": self._slots,
+            "occupied": len(self._holders),
+            "holders": {
+                coordinator.address: round(now - granted, 1)
+                for coordinator, granted in self._holders.items()
+            },
+            "waiting": [
+                coordinator.address
+                for _priority, _seq, coordinator, future in sorted(self._waiters)
+                if not future.done()
+            ],
+            "wait_time": self.wait_time.as_dict(),
+            "preemptions": self.preemptions,
+        }
@@ -14,7 +14,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
-from .coordinator import NordkappHeaterCoordinator
+from .coordinator import NordkappHeaterCoordinator, field_context
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -61,7 +61,7 @@ class NordkappHeaterButton(
         entry: ConfigEntry,
         description: NordkappButtonDescription,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, field_context())
         self.entity_description = description
         self._attr_unique_id = f"{entry.data['address']}_{description.key}"
         self._attr_device_info = DeviceInfo(
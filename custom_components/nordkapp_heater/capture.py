@@ -0,0 +1,191 @@
+"""Raw BLE frame capture and replay for Nordkapp Heater.
+
+A capture file starts with CAPTURE_MAGIC and holds one record per
+notification: a little-endian float64 monotonic timestamp, a uint16
+frame length and the frame bytes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import mmap
+import struct
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import IO, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+_LOGGER = logging.getLogger(__name__)
+
+CAPTURE_MAGIC = b"NKCAP\x01\x00\x00"
+CAPTURE_SUFFIX = ".nkcap"
+_RECORD = struct.Struct("<dH")
+
+# Buffered frames are written from the executor every few seconds, or
+# earlier once this many bytes are pending
+CAPTURE_FLUSH_INTERVAL = timedelta(seconds=5)
+CAPTURE_FLUSH_BYTES = 65536
+
+# Frames handed to the coordinator between yields to the event loop
+# when replaying as fast as possible
+_REPLAY_BATCH = 256
+
+
+class CaptureWriter:
+    """Append raw frames to a capture file without blocking the loop.
+
+    record() only packs the frame into an in-memory buffer. Buffered
+    frames are written by an executor job on a timer, when the buffer
+    grows past CAPTURE_FLUSH_BYTES, and on close.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: Path) -> None:
+        self._hass = hass
+        self.path = path
+        self._file: IO[bytes] | None = None
+        self._buffer = bytearray()
+        self._flush_lock = asyncio.Lock()
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        self.frames = 0
+        self.bytes_written = 0
+
+    async def async_open(self) -> None:
+        """Create the capture file and start the flush timer."""
+        self._file = await self._hass.async_add_executor_job(self._open)
+        self._unsub_flush = async_track_time_interval(
+            self._hass, self._async_flush_timer, CAPTURE_FLUSH_INTERVAL
+        )
+
+    def _open(self) -> IO[bytes]:
+        """Open the file for appending, writing the header if it is new."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        file = self.path.open("ab")
+        if file.tell() == 0:
+            file.write(CAPTURE_MAGIC)
+        return file
+
+    @callback
+    def record(self, data: memoryview, now: float) -> None:
+        """Buffer one frame received at monotonic time now."""
+        self._buffer += _RECORD.pack(now, len(data))
+        self._buffer += data
+        self.frames += 1
+        if len(self._buffer) >= CAPTURE_FLUSH_BYTES and not self._flush_lock.locked():
+            self._hass.async_create_task(self.async_flush())
+
+    @callback
+    def _async_flush_timer(self, _now: datetime) -> None:
+        """Flush buffered frames on the timer."""
+        if self._buffer and not self._flush_lock.locked():
+            self._hass.async_create_task(self.async_flush())
+
+    async def async_flush(self) -> None:
+        """Write buffered frames to disk."""
+        async with self._flush_lock:
+            if self._file is None or not self._buffer:
+                return
+            chunk, self._buffer = self._buffer, bytearray()
+            await self._hass.async_add_executor_job(self._write, chunk)
+            self.bytes_written += len(chunk)
+
+    def _write(self, chunk: bytearray) -> None:
+        """Append a chunk and push it to the OS."""
+        assert self._file is not None
+        self._file.write(chunk)
+        self._file.flush()
+
+    async def async_close(self) -> None:
+        """Flush remaining frames and close the file."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        await self.async_flush()
+        if self._file is not None:
+            await self._hass.async_add_executor_job(self._file.close)
+            self._file = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the capture state for service responses and diagnostics."""
+        return {
+            "path": str(self.path),
+            "frames": self.frames,
+            "bytes_written": self.bytes_written,
+        }
+
+
+@contextmanager
+def open_capture(path: Path) -> Iterator[Iterator[tuple[float, memoryview]]]:
+    """Memory-map a capture file, yield an iterator of its frames.
+
+    Frames are memoryviews into the mapping and are only valid until
+    the next frame is read.
+    """
+    with path.open("rb") as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        if mapped[: len(CAPTURE_MAGIC)] != CAPTURE_MAGIC:
+            raise ValueError(f"{path} is not a Nordkapp capture file")
+        view = memoryview(mapped)
+        frames = _iter_frames(view)
+        try:
+            yield frames
+        finally:
+            # Release the last frame view before the mapping closes
+            frames.close()
+            view.release()
+
+
+def _iter_frames(view: memoryview) -> Iterator[tuple[float, memoryview]]:
+    """Yield (timestamp, frame) pairs, stopping at a truncated record."""
+    offset = len(CAPTURE_MAGIC)
+    end = len(view)
+    while offset + _RECORD.size <= end:
+        timestamp, length = _RECORD.unpack_from(view, offset)
+        offset += _RECORD.size
+        if offset + length > end:
+            break
+        with view[offset : offset + length] as frame:
+            yield timestamp, frame
+        offset += length
+
+
+async def async_replay(
+    path: Path,
+    handle: Callable[[int, Any], None],
+    speed: float | None = 1.0,
+) -> dict[str, float | int]:
+    """Feed captured frames to a notification handler.
+
+    speed is a multiple of real time; None replays as fast as possible,
+    yielding to the event loop every few hundred frames. Pass the
+    coordinator's _handle_notification as handle. The file is read from
+    the event loop, so only replay from development and test code.
+    """
+    frames = 0
+    started = time.monotonic()
+    with open_capture(path) as records:
+        first: float | None = None
+        for timestamp, frame in records:
+            if first is None:
+                first = timestamp
+            if speed:
+                delay = (timestamp - first) / speed - (time.monotonic() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            elif frames % _REPLAY_BATCH == 0:
+                await asyncio.sleep(0)
+            handle(0, frame)
+            frames += 1
+    elapsed = time.monotonic() - started
+    _LOGGER.debug("Replayed %d frames from %s in %.2fs", frames, path, elapsed)
+    return {
+        "frames": frames,
+        "elapsed": elapsed,
+        "frames_per_second": frames / elapsed if elapsed else 0.0,
+    }
@@ -24,7 +24,11 @@ from .const import (
     TEMP_MAX,
     TEMP_MIN,
 )
-from .coordinator import NordkappHeaterCoordinator, NordkappHeaterData
+from .coordinator import (
+    NordkappHeaterCoordinator,
+    NordkappHeaterData,
+    field_context,
+)
 
 PRESET_AUTO = "auto"
 PRESET_MANUAL = "manual"
@@ -67,7 +71,12 @@ class NordkappHeaterClimate(
     def __init__(
         self, coordinator: NordkappHeaterCoordinator, entry: ConfigEntry
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(
+            coordinator,
+            field_context(
+                "ambient_temp", "target_temp", "machine_status", "run_mode"
+            ),
+        )
         self._attr_unique_id = f"{entry.data['address']}_climate"
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, entry.data["address"])},
@@ -0,0 +1,259 @@
+"""Serialized command writer for Nordkapp Heater."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+
+from bleak import BleakError
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+
+from .metrics import LatencyStats
+
+_LOGGER = logging.getLogger(__name__)
+
+# Errors a BLE write can end in, failing only the command being written
+WRITE_ERRORS = (BleakError, TimeoutError, OSError)
+
+
+@dataclass
+class _PendingCommand:
+    """Command waiting for the writer task."""
+
+    packet: bytes
+    queued_at: float
+    ack: Hashable | None
+    waiters: list[asyncio.Future[None]] = field(default_factory=list)
+
+
+@dataclass
+class _InFlight:
+    """Written command waiting for the heater's reply."""
+
+    key: Hashable
+    command: _PendingCommand
+    timeout: float
+    sent: float = 0.0
+    attempts: int = 0
+    unsub_resend: CALLBACK_TYPE | None = None
+
+
+class CommandQueue:
+    """Send heater commands one at a time from a single writer task.
+
+    Commands are keyed by kind. A command submitted while another of the
+    same kind is still pending replaces its packet (last write wins), and
+    all callers of the merged command are resolved by the one write.
+
+    Acknowledged commands are resolved by acknowledge() with their reply
+    key once the heater replies. The reply key can carry more than the
+    merge key, like a button nonce, so a late reply to a replaced packet
+    does not resolve its successor. The writer does not wait for replies:
+    a timer per command queues a resend of the identical packet (same
+    nonce, so the heater can drop duplicates) with a doubling timeout
+    until the retries are used up, and other commands go out meanwhile.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        write: Callable[[bytes], Awaitable[None]],
+        interval: float,
+        ack_timeout: float,
+        retries: int,
+    ) -> None:
+        self._hass = hass
+        self._write = write
+        self._interval = interval
+        self._ack_timeout = ack_timeout
+        self._retries = retries
+        self._pending: dict[Hashable, _PendingCommand] = {}
+        self._awaiting: dict[Hashable, _InFlight] = {}
+        self._resends: deque[_InFlight] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._busy = False
+        self.merged = 0
+        self.resent = 0
+        self.unacknowledged = 0
+        self.wait_time = LatencyStats()
+        self.ack_latency: dict[Hashable, LatencyStats] = {}
+
+    def submit(
+        self, key: Hashable, packet: bytes, ack: Hashable | None = None
+    ) -> asyncio.Future[None]:
+        """Queue a packet, return a future resolved once it is delivered.
+
+        With an ack key the command is delivered once acknowledge() is
+        called with that key.
+        """
+        future: asyncio.Future[None] = self._hass.loop.create_future()
+        if (pending := self._pending.get(key)) is not None:
+            pending.packet = packet
+            pending.ack = ack
+            pending.waiters.append(future)
+            self.merged += 1
+        else:
+            self._pending[key] = _PendingCommand(
+                packet, time.monotonic(), ack, [future]
+            )
+        self._wake()
+        return future
+
+    def _wake(self) -> None:
+        """Start the writer task if needed and let it run."""
+        if self._task is None:
+            self._task = self._hass.async_create_background_task(
+                self._run(), "nordkapp_heater command writer"
+            )
+        self._wakeup.set()
+
+    @property
+    def idle(self) -> bool:
+        """Return True when no command is queued, in flight or unacknowledged."""
+        return not self._pending and not self._busy and not self._awaiting
+
+    async def _run(self) -> None:
+        """Write resends and pending commands in order, paced by the interval."""
+        while True:
+            await self._wakeup.wait()
+            while self._resends or self._pending:
+                self._busy = True
+                try:
+                    if self._resends:
+                        await self._transmit(self._resends.popleft())
+                    else:
+                        key = next(iter(self._pending))
+                        await self._deliver(key, self._pending.pop(key))
+                finally:
+                    self._busy = False
+                await asyncio.sleep(self._interval)
+            self._wakeup.clear()
+
+    async def _deliver(self, key: Hashable, pending: _PendingCommand) -> None:
+        """Write a command, then leave it to its resend timer if acknowledged."""
+        self.wait_time.add(time.monotonic() - pending.queued_at)
+        if pending.ack is None:
+            try:
+                await self._write(pending.packet)
+            except WRITE_ERRORS as err:
+                _LOGGER.debug("Command %s failed: %s", key, err)
+                self._resolve(pending, err)
+            else:
+                self._resolve(pending, None)
+            return
+        if (previous := self._awaiting.pop(pending.ack, None)) is not None:
+            # Replaced before its reply came, one reply now resolves both
+            self._cancel_resend(previous)
+            pending.waiters[:0] = previous.command.waiters
+        # Expect the reply before writing, it may beat the write's return
+        self._awaiting[pending.ack] = _InFlight(key, pending, self._ack_timeout)
+        await self._transmit(self._awaiting[pending.ack])
+
+    async def _transmit(self, inflight: _InFlight) -> None:
+        """Write an acknowledged command and arm its reply timeout."""
+        ack = inflight.command.ack
+        if self._awaiting.get(ack) is not inflight:
+            # Acknowledged or replaced while waiting for the writer
+            return
+        if inflight.attempts:
+            self.resent += 1
+            _LOGGER.debug(
+                "Resending command %s (attempt %d)",
+                inflight.key,
+                inflight.attempts + 1,
+            )
+        inflight.attempts += 1
+        inflight.sent = time.monotonic()
+        try:
+            await self._write(inflight.command.packet)
+        except WRITE_ERRORS as err:
+            _LOGGER.debug("Command %s failed: %s", inflight.key, err)
+            if self._awaiting.get(ack) is inflight:
+                del self._awaiting[ack]
+                self._resolve(inflight.command, err)
+            return
+        if self._awaiting.get(ack) is inflight:
+            inflight.unsub_resend = async_call_later(
+                self._hass,
+                inflight.timeout,
+                partial(self._async_reply_timeout, inflight),
+            )
+
+    @callback
+    def _async_reply_timeout(self, inflight: _InFlight, _now: datetime) -> None:
+        """Queue a resend with a doubled timeout, or give up."""
+        inflight.unsub_resend = None
+        ack = inflight.command.ack
+        if self._awaiting.get(ack) is not inflight:
+            return
+        if inflight.attempts > self._retries:
+            del self._awaiting[ack]
+            self.unacknowledged += 1
+            self._resolve(
+                inflight.command,
+                HomeAssistantError(
+                    f"Heater did not acknowledge command {inflight.key}"
+                ),
+            )
+            return
+        inflight.timeout *= 2
+        self._resends.append(inflight)
+        self._wake()
+
+    def acknowledge(self, key: Hashable) -> bool:
+        """Resolve the command awaiting a reply with this reply key."""
+        inflight = self._awaiting.pop(key, None)
+        if inflight is None:
+            return False
+        self._cancel_resend(inflight)
+        self.ack_latency.setdefault(inflight.key, LatencyStats()).add(
+            time.monotonic() - inflight.sent
+        )
+        self._resolve(inflight.command, None)
+        return True
+
+    @staticmethod
+    def _cancel_resend(inflight: _InFlight) -> None:
+        """Stop the reply timeout of a command."""
+        if inflight.unsub_resend is not None:
+            inflight.unsub_resend()
+            inflight.unsub_resend = None
+
+    @staticmethod
+    def _resolve(pending: _PendingCommand, err: Exception | None) -> None:
+        """Resolve all callers waiting on a command."""
+        for future in pending.waiters:
+            if future.done():
+                continue
+            if err is None:
+                future.set_result(None)
+            else:
+                future.set_exception(err)
+
+    async def async_stop(self) -> None:
+        """Stop the writer task and fail pending and unacknowledged commands."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._busy = False
+        self._resends.clear()
+        awaiting, self._awaiting = self._awaiting, {}
+        for inflight in awaiting.values():
+            self._cancel_resend(inflight)
+            self._resolve(inflight.command, BleakError("Command queue stopped"))
+        pending, self._pending = self._pending, {}
+        for command in pending.values():
+            self._resolve(command, BleakError("Command queue stopped"))
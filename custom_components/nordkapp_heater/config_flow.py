@@ -7,9 +7,43 @@ import re
 
 import voluptuous as vol
 from homeassistant.components.bluetooth import BluetoothServiceInfoBleak
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.core import callback
 
-from .const import DOMAIN
+from .const import (
+    CADENCE_INTERVAL_MAX,
+    CADENCE_INTERVAL_MIN,
+    COALESCE_WINDOW_MAX,
+    CONF_COALESCE_WINDOW,
+    CONF_FAST_INTERVAL,
+    CONF_IDLE_DISCONNECT,
+    CONF_IDLE_REFRESH,
+    CONF_IDLE_TIMEOUT,
+    CONF_PUMP_STROKE_VOLUME,
+    CONF_RUN_INTERVAL,
+    CONF_SLOW_INTERVAL,
+    CONF_STREAM_INTERVAL,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_FAST_INTERVAL,
+    DEFAULT_IDLE_DISCONNECT,
+    DEFAULT_IDLE_REFRESH,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_PUMP_STROKE_VOLUME,
+    DEFAULT_RUN_INTERVAL,
+    DEFAULT_SLOW_INTERVAL,
+    DEFAULT_STREAM_INTERVAL,
+    DOMAIN,
+    IDLE_MINUTES_MAX,
+    PUMP_STROKE_VOLUME_MAX,
+    PUMP_STROKE_VOLUME_MIN,
+    STREAM_INTERVAL_MAX,
+    STREAM_INTERVAL_MIN,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,6 +58,12 @@ class NordkappHeaterConfigFlow(ConfigFlow, domain=DOMAIN):
     def __init__(self) -> None:
         self._discovery_info: BluetoothServiceInfoBleak | None = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Return the options flow handler."""
+        return NordkappHeaterOptionsFlow()
+
     async def async_step_bluetooth(
         self, discovery_info: BluetoothServiceInfoBleak
     ) -> ConfigFlowResult:
@@ -75,3 +115,85 @@ class NordkappHeaterConfigFlow(ConfigFlow, domain=DOMAIN):
             ),
             errors=errors,
         )
+
+
+class NordkappHeaterOptionsFlow(OptionsFlow):
+    """Handle options for Nordkapp Heater."""
+
+    async def async_step_init(
+        self, user_input: dict | None = None
+    ) -> ConfigFlowResult:
+        """Manage status stream and connection options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        cadence = vol.All(
+            vol.Coerce(int),
+            vol.Range(min=CADENCE_INTERVAL_MIN, max=CADENCE_INTERVAL_MAX),
+        )
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_STREAM_INTERVAL,
+                        default=options.get(
+                            CONF_STREAM_INTERVAL, DEFAULT_STREAM_INTERVAL
+                        ),
+                    ): vol.All(
+                        vol.Coerce(float),
+                        vol.Range(min=STREAM_INTERVAL_MIN, max=STREAM_INTERVAL_MAX),
+                    ),
+                    vol.Required(
+                        CONF_COALESCE_WINDOW,
+                        default=options.get(
+                            CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int), vol.Range(min=0, max=COALESCE_WINDOW_MAX)
+                    ),
+                    vol.Required(
+                        CONF_FAST_INTERVAL,
+                        default=options.get(CONF_FAST_INTERVAL, DEFAULT_FAST_INTERVAL),
+                    ): cadence,
+                    vol.Required(
+                        CONF_RUN_INTERVAL,
+                        default=options.get(CONF_RUN_INTERVAL, DEFAULT_RUN_INTERVAL),
+                    ): cadence,
+                    vol.Required(
+                        CONF_SLOW_INTERVAL,
+                        default=options.get(CONF_SLOW_INTERVAL, DEFAULT_SLOW_INTERVAL),
+                    ): cadence,
+                    vol.Required(
+                        CONF_IDLE_DISCONNECT,
+                        default=options.get(
+                            CONF_IDLE_DISCONNECT, DEFAULT_IDLE_DISCONNECT
+                        ),
+                    ): bool,
+                    vol.Required(
+                        CONF_IDLE_TIMEOUT,
+                        default=options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT),
+                    ): vol.All(
+                        vol.Coerce(int), vol.Range(min=1, max=IDLE_MINUTES_MAX)
+                    ),
+                    vol.Required(
+                        CONF_IDLE_REFRESH,
+                        default=options.get(CONF_IDLE_REFRESH, DEFAULT_IDLE_REFRESH),
+                    ): vol.All(
+                        vol.Coerce(int), vol.Range(min=1, max=IDLE_MINUTES_MAX)
+                    ),
+                    vol.Required(
+                        CONF_PUMP_STROKE_VOLUME,
+                        default=options.get(
+                            CONF_PUMP_STROKE_VOLUME, DEFAULT_PUMP_STROKE_VOLUME
+                        ),
+                    ): vol.All(
+                        vol.Coerce(float),
+                        vol.Range(
+                            min=PUMP_STROKE_VOLUME_MIN, max=PUMP_STROKE_VOLUME_MAX
+                        ),
+                    ),
+                }
+            ),
+        )
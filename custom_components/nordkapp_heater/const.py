@@ -1,5 +1,10 @@
 """Constants for Nordkapp Heater integration."""
 
+import struct
+from datetime import timedelta
+from functools import lru_cache
+from typing import Any, NamedTuple
+
 from homeassistant.const import Platform
 
 DOMAIN = "nordkapp_heater"
@@ -11,6 +16,7 @@ PLATFORMS = [
     Platform.SENSOR,
     Platform.BINARY_SENSOR,
     Platform.BUTTON,
+    Platform.NUMBER,
 ]
 
 # BLE UUIDs
@@ -25,6 +31,13 @@ CRC16_TABLE = [
     33032, 37161, 41290, 45419, 49548, 53677, 57806, 61935,
 ]
 
+# Byte-wise CRC16 table, expanded from the nibble table above
+CRC16_TABLE_256 = tuple(
+    ((CRC16_TABLE[i >> 4] << 4) & 0xFFFF)
+    ^ CRC16_TABLE[((CRC16_TABLE[i >> 4] >> 12) ^ i) & 0x0F]
+    for i in range(256)
+)
+
 # Command IDs (app -> heater)
 CMD_BUTTON = 0x61
 CMD_MANUAL_PUMP = 0x62
@@ -86,6 +99,9 @@ MACHINE_STATUS = {
 # States considered "running" (heater is on)
 RUNNING_STATES = {0, 1, 2, 3, 7, 8, 9, 10}
 
+# Standby state
+STATE_STANDBY = 5
+
 # States considered "heating"
 HEATING_STATES = {0, 1, 2, 3, 9, 10}
 
@@ -97,26 +113,169 @@ TEMP_MAX = 36
 GEAR_MIN = 1
 GEAR_MAX = 10
 
+# Timer limits (hours until the heater starts, 0 = off)
+TIMER_MIN = 0
+TIMER_MAX = 24
+# A start within this long of the scheduled time is taken as the timer
+# firing, since the heater only counts whole hours
+SCHEDULE_TOLERANCE = timedelta(hours=1)
+
+# Start-stop temperature difference limits
+TEMP_DIFF_MIN = 1
+TEMP_DIFF_MAX = 10
+
 # Polling
 DEFAULT_POLL_INTERVAL = 15  # seconds
 STATUS_PACKET_MIN_LENGTH = 50
 BIND_DELAY = 0.5  # seconds
+FIRST_STATUS_TIMEOUT = 5.0  # seconds
+CONNECT_ATTEMPTS = 3
+RECONNECT_BACKOFF_MIN = 1.0  # seconds, doubled after every failed attempt
+RECONNECT_BACKOFF_MAX = 300.0  # seconds
+BIND_TIMEOUT = 5.0  # seconds
+COMMAND_INTERVAL = 0.1  # seconds between queued writes
+COMMAND_ACK_TIMEOUT = 1.0  # seconds, doubled on every resend
+COMMAND_RETRIES = 2
+# Optimistic values wait this long (plus one stream interval) for the
+# heater to confirm, and are only treated as contradicted once a status
+# frame arrives OPTIMISTIC_SETTLE after the command was acknowledged
+OPTIMISTIC_TIMEOUT = 10.0  # seconds
+OPTIMISTIC_SETTLE = 1.0  # seconds
+
+# Options
+CONF_STREAM_INTERVAL = "stream_interval"
+CONF_COALESCE_WINDOW = "coalesce_window"
+CONF_IDLE_DISCONNECT = "idle_disconnect"
+CONF_IDLE_TIMEOUT = "idle_timeout"
+CONF_IDLE_REFRESH = "idle_refresh"
+CONF_FAST_INTERVAL = "fast_interval"
+CONF_RUN_INTERVAL = "run_interval"
+CONF_SLOW_INTERVAL = "slow_interval"
+CONF_PUMP_STROKE_VOLUME = "pump_stroke_volume"
+
+# Status stream (AUTO_UPDATA arg1 is the push interval in 0.1 s units)
+AUTO_UPDATA_MODE = 2
+AUTO_UPDATA_COUNT = 99
+DEFAULT_STREAM_INTERVAL = 2.0  # seconds
+STREAM_INTERVAL_MIN = 0.5
+STREAM_INTERVAL_MAX = 25.5
+DEFAULT_COALESCE_WINDOW = 0  # milliseconds, 0 = publish every change
+COALESCE_WINDOW_MAX = 60000
+
+# Idle disconnect: drop the link after this long in standby, then only
+# reconnect briefly on the refresh schedule or for user commands
+DEFAULT_IDLE_DISCONNECT = False
+DEFAULT_IDLE_TIMEOUT = 10  # minutes
+DEFAULT_IDLE_REFRESH = 30  # minutes
+IDLE_MINUTES_MAX = 1440
+
+# Refresh cadence by machine state: fast while starting up or burning
+# out, slow in standby or error, the run interval otherwise
+FAST_CADENCE_STATES = {0, 1, 4}
+SLOW_CADENCE_STATES = {5, 6}
+DEFAULT_FAST_INTERVAL = 5  # seconds
+DEFAULT_RUN_INTERVAL = DEFAULT_POLL_INTERVAL
+DEFAULT_SLOW_INTERVAL = 60  # seconds
+CADENCE_INTERVAL_MIN = 1
+CADENCE_INTERVAL_MAX = 300
+
+# Fuel totalizer: pump_freq is strokes per second, integrated per frame.
+# Gaps longer than TOTALIZER_MAX_GAP (reconnects) are not integrated.
+DEFAULT_PUMP_STROKE_VOLUME = 0.022  # ml per stroke
+PUMP_STROKE_VOLUME_MIN = 0.005
+PUMP_STROKE_VOLUME_MAX = 0.1
+TOTALIZER_MAX_GAP = 30.0  # seconds
+
+# Register reads: CMD_GET_REG_ADDR with the register number in arg0,
+# answered by RESP_REG_ADDR (commands 0x6n are answered by 0x4n) echoing
+# it in byte 3 with a little-endian 16-bit value in bytes 4-5. The reply
+# layout is not confirmed on hardware. Several reads are in flight at
+# once.
+DATA_REGISTERS = f"{DOMAIN}_registers"
+REGISTER_READ_TIMEOUT = 2.0  # seconds for a batch of reads
+REGISTER_READ_RETRIES = 1
+
+# Registers that never change on a device, read once and cached
+STATIC_REGISTERS = {
+    "firmware_version": 0x00,
+    "hardware_version": 0x01,
+    "model": 0x02,
+    "pump_calibration": 0x10,
+}
+
+# Parameters mirrored by the coordinator, by SHORT_PARA type: the data
+# field holding the value and the register it could be read back from.
+# The mirror is read after every bind and kept current from RESP_PARA.
+# The register numbers are unconfirmed, like the static ones, so replies
+# are checked against REGISTER_RANGES: a wrong guess leaves the mirror
+# unknown instead of showing a bogus timer and scheduled start.
+PARA_FIELDS = {PARA_TIMER: "timer", PARA_TEMP_DIFF: "temp_diff"}
+PARA_REGISTERS = {PARA_TIMER: 0x20, PARA_TEMP_DIFF: 0x21}
+
+# Plausible value of every register read. Replies outside the range are
+# dropped, so a wrong register number or reply layout shows up as a
+# missing value instead of 0x0000/0xFFFF filler or a bogus setting.
+REGISTER_RANGES = {
+    STATIC_REGISTERS["firmware_version"]: (0x0001, 0xFFFE),
+    STATIC_REGISTERS["hardware_version"]: (0x0001, 0xFFFE),
+    STATIC_REGISTERS["model"]: (0x0001, 0xFFFE),
+    # Microliters per pump stroke, like the stroke volume option
+    STATIC_REGISTERS["pump_calibration"]: (
+        round(PUMP_STROKE_VOLUME_MIN * 1000),
+        round(PUMP_STROKE_VOLUME_MAX * 1000),
+    ),
+    PARA_REGISTERS[PARA_TIMER]: (TIMER_MIN, TIMER_MAX),
+    PARA_REGISTERS[PARA_TEMP_DIFF]: (TEMP_DIFF_MIN, TEMP_DIFF_MAX),
+}
+# Register values are cached under this layout. Bump it whenever the
+# register numbers, reply layout or ranges are corrected, so values read
+# under the old guess are thrown away.
+REGISTER_LAYOUT = 1
+
+# Last known state, restored so setup does not wait for the heaters
+DATA_SNAPSHOTS = f"{DOMAIN}_snapshots"
+# A restored state stays available this long while no scanner has seen
+# the heater yet; a failed connect attempt hides it right away
+STALE_GRACE = 120.0  # seconds
+
+# Connection slots shared by all heaters on one Home Assistant host
+DATA_BROKER = f"{DOMAIN}_broker"
+CONNECTION_SLOTS = 3
+STANDBY_SLICE = 60.0  # seconds a standby heater may hold a contended slot
+SLOT_WAIT_TIMEOUT = 30.0  # seconds
+COMMAND_SLOT_TIMEOUT = 10.0  # seconds
+
+# Telemetry history: one sample per 2 s for 24 h, about 2 MB per heater
+TELEMETRY_CAPACITY = 43200
+TELEMETRY_SPACING = 2.0  # seconds
+
+# Raw frames kept for diagnostics, each stored in a fixed-size slot
+FRAME_LOG_SIZE = 200
+FRAME_SLOT_SIZE = 64  # bytes
+
+# Hot-path performance sensors refresh on their own timer, the debug
+# summary is logged less often
+PERF_SAMPLE_INTERVAL = 30  # seconds
+PERF_LOG_INTERVAL = 300  # seconds
 
 # N/A sensor value
 SENSOR_NA_VALUE = 32760  # 0x7FF8
 
+# Upper bound for cached pre-built packets (keepalive, bind, button nonces)
+PACKET_CACHE_SIZE = 1024
+
 
-def crc16(data: list[int] | bytearray | bytes, length: int) -> int:
-    """Calculate CRC16 checksum (from APK source)."""
+def crc16(
+    data: list[int] | bytearray | bytes | memoryview, length: int
+) -> int:
+    """Calculate CRC16 checksum (same result as the APK nibble loop)."""
+    if not isinstance(data, memoryview):
+        data = memoryview(bytes(data) if isinstance(data, list) else data)
     crc = 0
-    for i in range(length):
-        a = (crc >> 12) & 0xFFFF
-        crc = (crc << 4) & 0xFFFF
-        crc ^= CRC16_TABLE[((a & 0xFFFF) ^ (data[i] >> 4)) & 0x0F]
-        a = (crc & 0xFFFF) >> 12
-        crc = (crc << 4) & 0xFFFF
-        crc ^= CRC16_TABLE[((a & 0xFFFF) ^ (data[i] & 0x0F)) & 0x0F]
-    return crc & 0xFFFF
+    table = CRC16_TABLE_256
+    for b in data[:length]:
+        crc = ((crc << 8) & 0xFFFF) ^ table[(crc >> 8) ^ b]
+    return crc
 
 
 def build_cmd(cmd_id: int, arg0: int = 0, arg1: int = 0, arg2: int = 0) -> bytearray:
@@ -128,7 +287,13 @@ def build_cmd(cmd_id: int, arg0: int = 0, arg1: int = 0, arg2: int = 0) -> bytea
     return bytearray(pkt)
 
 
-def build_bind_response(mac_bytes: list[int]) -> bytearray:
+@lru_cache(maxsize=PACKET_CACHE_SIZE)
+def cached_cmd(cmd_id: int, arg0: int = 0, arg1: int = 0, arg2: int = 0) -> bytes:
+    """Return an immutable, cached 8-byte command packet."""
+    return bytes(build_cmd(cmd_id, arg0, arg1, arg2))
+
+
+def build_bind_response(mac_bytes: list[int] | tuple[int, ...]) -> bytearray:
     """Build 12-byte bind response (0x91) from MAC bytes."""
     pkt = [0xAA, 0x00, CMD_BIND, 0, 0, 0, 0, 0, 0, 0, 0, 0]
     for i in range(6):
@@ -140,6 +305,81 @@ def build_bind_response(mac_bytes: list[int]) -> bytearray:
     return bytearray(pkt)
 
 
+@lru_cache(maxsize=PACKET_CACHE_SIZE)
+def cached_bind_response(mac_bytes: tuple[int, ...]) -> bytes:
+    """Return an immutable, cached bind response for a MAC."""
+    return bytes(build_bind_response(mac_bytes))
+
+
+class StatusField(NamedTuple):
+    """Field of the 0xFF status broadcast."""
+
+    name: str
+    offset: int
+    fmt: str  # struct format character (little-endian)
+    scale: int | None = None  # divisor applied to the raw value
+    na: int | None = None  # raw value reported when the sensor is missing
+
+
+# Status broadcast layout, ordered by offset
+STATUS_FIELDS: tuple[StatusField, ...] = (
+    StatusField("machine_status", 8, "B"),
+    StatusField("run_flags", 9, "B"),
+    StatusField("voltage", 10, "H", 10),
+    StatusField("altitude", 12, "H"),
+    StatusField("ambient_temp", 14, "h", 10, SENSOR_NA_VALUE),
+    StatusField("shell_temp", 16, "h", 10, SENSOR_NA_VALUE),
+    StatusField("pump_freq", 18, "H", 10),
+    StatusField("ignition_power", 20, "H", 10),
+    StatusField("fan_rpm", 22, "H"),
+    StatusField("error_code", 28, "H"),
+    StatusField("gear", 40, "B"),
+    StatusField("target_temp", 41, "B"),
+)
+
+
+def _build_status_struct(fields: tuple[StatusField, ...]) -> struct.Struct:
+    """Compile the status field table into a single struct layout."""
+    fmt = "<"
+    pos = 0
+    for field in fields:
+        if field.offset > pos:
+            fmt += f"{field.offset - pos}x"
+        fmt += field.fmt
+        pos = field.offset + struct.calcsize(f"<{field.fmt}")
+    return struct.Struct(fmt)
+
+
+STATUS_STRUCT = _build_status_struct(STATUS_FIELDS)
+_STATUS_NAMES = tuple(field.name for field in STATUS_FIELDS)
+_STATUS_CONVERSIONS = tuple(
+    (i, field.scale, field.na)
+    for i, field in enumerate(STATUS_FIELDS)
+    if field.scale or field.na is not None
+)
+
+
+def decode_status(data: bytes | bytearray | memoryview) -> dict[str, Any]:
+    """Decode a status broadcast into NordkappHeaterData field values."""
+    raw = list(STATUS_STRUCT.unpack_from(data))
+    for i, scale, na in _STATUS_CONVERSIONS:
+        value = raw[i]
+        if value == na:
+            raw[i] = None
+        elif scale:
+            raw[i] = value / scale
+    values = dict(zip(_STATUS_NAMES, raw))
+
+    values["machine_status"] &= 0x0F
+    running = values.pop("run_flags")
+    values["run_mode"] = (running >> 5) & 3
+    values["pump_active"] = (running & 0x03) != 0
+    values["fan_active"] = bool((running >> 2) & 1)
+    values["glow_plug_active"] = bool((running >> 3) & 1)
+    values["temp_unit_fahrenheit"] = bool((running >> 4) & 1)
+    return values
+
+
 def le16(data: bytes, offset: int) -> int:
     """Read 16-bit little-endian unsigned value."""
     return (data[offset + 1] << 8) | data[offset]
@@ -5,51 +5,160 @@ from __future__ import annotations
 import asyncio
 import logging
 import random
-from dataclasses import dataclass
-from datetime import timedelta
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from functools import partial
+from pathlib import Path
+from typing import Any
 
 from bleak import BleakClient, BleakError
-from homeassistant.components.bluetooth import async_ble_device_from_address
+from bleak.backends.device import BLEDevice
+from bleak_retry_connector import (
+    BleakClientWithServiceCache,
+    establish_connection,
+)
+from homeassistant.components.bluetooth import (
+    BluetoothCallbackMatcher,
+    BluetoothChange,
+    BluetoothScanningMode,
+    BluetoothServiceInfoBleak,
+    async_ble_device_from_address,
+    async_register_callback,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_time_interval,
+)
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
 
+from .broker import (
+    PRIORITY_COMMAND,
+    PRIORITY_RUNNING,
+    PRIORITY_STANDBY,
+    ConnectionBroker,
+)
+from .capture import CaptureWriter
+from .commands import CommandQueue
 from .const import (
+    AUTO_UPDATA_COUNT,
+    AUTO_UPDATA_MODE,
+    BIND_DELAY,
+    BIND_TIMEOUT,
     BTN_CLEAR_ERROR,
     BTN_POWER_OFF,
     BTN_POWER_ON,
     BTN_VENTILATION,
     CMD_AUTO_UPDATA,
     CMD_BUTTON,
+    CMD_GET_REG_ADDR,
     CMD_SHORT_PARA,
-    DEFAULT_POLL_INTERVAL,
+    COMMAND_ACK_TIMEOUT,
+    COMMAND_INTERVAL,
+    COMMAND_RETRIES,
+    COMMAND_SLOT_TIMEOUT,
+    CONF_COALESCE_WINDOW,
+    CONF_FAST_INTERVAL,
+    CONF_IDLE_DISCONNECT,
+    CONF_IDLE_REFRESH,
+    CONF_IDLE_TIMEOUT,
+    CONF_PUMP_STROKE_VOLUME,
+    CONF_RUN_INTERVAL,
+    CONF_SLOW_INTERVAL,
+    CONF_STREAM_INTERVAL,
+    CONNECT_ATTEMPTS,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_FAST_INTERVAL,
+    DEFAULT_IDLE_DISCONNECT,
+    DEFAULT_IDLE_REFRESH,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_PUMP_STROKE_VOLUME,
+    DEFAULT_RUN_INTERVAL,
+    DEFAULT_SLOW_INTERVAL,
+    DEFAULT_STREAM_INTERVAL,
     DOMAIN,
+    FAST_CADENCE_STATES,
+    FIRST_STATUS_TIMEOUT,
+    FRAME_LOG_SIZE,
+    FRAME_SLOT_SIZE,
+    HEATING_STATES,
     NOTIFY_CHAR_UUID,
+    OPTIMISTIC_SETTLE,
+    OPTIMISTIC_TIMEOUT,
+    PARA_FIELDS,
+    PARA_REGISTERS,
     PARA_RUN_MODE,
     PARA_TARGET_GEAR,
     PARA_TARGET_TEMP,
+    PARA_TEMP_DIFF,
+    PARA_TIMER,
+    PERF_LOG_INTERVAL,
+    PERF_SAMPLE_INTERVAL,
+    RECONNECT_BACKOFF_MAX,
+    RECONNECT_BACKOFF_MIN,
+    REGISTER_RANGES,
+    REGISTER_READ_RETRIES,
+    REGISTER_READ_TIMEOUT,
     RESP_BIND_ACCEPTED,
     RESP_BIND_REQUEST,
     RESP_CMD_ACK,
     RESP_PARA,
+    RESP_REG_ADDR,
     RESP_STATUS,
+    RUNNING_STATES,
+    SCHEDULE_TOLERANCE,
     SERVICE_CHANGED_UUID,
+    SLOT_WAIT_TIMEOUT,
+    SLOW_CADENCE_STATES,
+    STALE_GRACE,
+    STATE_STANDBY,
+    STATIC_REGISTERS,
     STATUS_PACKET_MIN_LENGTH,
+    TELEMETRY_CAPACITY,
+    TELEMETRY_SPACING,
+    TOTALIZER_MAX_GAP,
     WRITE_CHAR_UUID,
-    build_bind_response,
-    build_cmd,
-    le16,
-    le16s,
+    cached_bind_response,
+    cached_cmd,
+    decode_status,
 )
+from .metrics import FrameLog, IntervalMean, LatencyStats
+from .registers import RegisterCache
+from .snapshots import SnapshotStore
+from .telemetry import TelemetryBuffer
 
 _LOGGER = logging.getLogger(__name__)
 
 
+# Opens a client to the heater address, given the disconnect callback.
+# The default goes through bleak-retry-connector; the tests inject
+# the simulated heater of tests/simulator.py.
+ClientFactory = Callable[
+    [str, Callable[[BleakClient], None]], Awaitable[BleakClientWithServiceCache]
+]
+
+# Not restored from a snapshot: liveness is re-established by the first
+# status frame and the totals are restored by their own sensors
+SNAPSHOT_EXCLUDED = frozenset(("available", "stale", "fuel_used", "run_hours"))
+
+
+def field_context(*fields: str) -> frozenset[str]:
+    """Return the listener context for an entity depending on data fields."""
+    return frozenset(("available", *fields))
+
+
 @dataclass
 class NordkappHeaterData:
     """Parsed heater status data."""
 
     available: bool = False
+    # Restored from the last snapshot, no status frame received yet
+    stale: bool = False
     machine_status: int = 5  # standby
     run_mode: int = 0  # auto
     voltage: float = 0.0
@@ -66,164 +175,876 @@ class NordkappHeaterData:
     fan_active: bool = False
     glow_plug_active: bool = False
     temp_unit_fahrenheit: bool = False
+    # Totals integrated by the coordinator, restored by their sensors
+    fuel_used: float = 0.0  # liters
+    run_hours: float = 0.0
+    # Parameter mirror, read after bind and updated from RESP_PARA
+    timer: int | None = None  # hours, 0 = off
+    temp_diff: int | None = None
+    # When the on-device timer will start the heater, derived from timer
+    scheduled_start: datetime | None = None
+
+
+@dataclass
+class _Overlay:
+    """Commanded value shown until the heater confirms or contradicts it."""
+
+    value: Any
+    unsub_expire: CALLBACK_TYPE
+    acked_at: float | None = None
 
 
 class NordkappHeaterCoordinator(DataUpdateCoordinator[NordkappHeaterData]):
     """Manages BLE connection, polling, and commands for Nordkapp Heater."""
 
     def __init__(
-        self, hass: HomeAssistant, address: str, entry: ConfigEntry
+        self,
+        hass: HomeAssistant,
+        address: str,
+        entry: ConfigEntry,
+        broker: ConnectionBroker,
+        client_factory: ClientFactory | None = None,
+        register_cache: RegisterCache | None = None,
+        snapshots: SnapshotStore | None = None,
     ) -> None:
-        super().__init__(
-            hass,
-            _LOGGER,
-            name=DOMAIN,
-            update_interval=timedelta(seconds=DEFAULT_POLL_INTERVAL),
-        )
+        # No update_interval: every publish would push the poll back, so
+        # the link is maintained from its own timer, see async_start
+        super().__init__(hass, _LOGGER, name=DOMAIN)
         self.address = address
         self.entry = entry
-        self._client: BleakClient | None = None
+        self._broker = broker
+        self._client_factory = client_factory
+        self._register_cache = register_cache or RegisterCache(hass)
+        self._register_reads: dict[int, asyncio.Future[int]] = {}
+        self._snapshots = snapshots or SnapshotStore(hass)
+        self._client: BleakClientWithServiceCache | None = None
         self._connected = False
         self._bound = False
         self._data = NordkappHeaterData()
-        self._mac_bytes = [int(b, 16) for b in address.split(":")]
+        self._stale_until = 0.0
+        if (snapshot := self._snapshots.get(address)) is not None:
+            self._restore_snapshot(snapshot)
+        self._mac_bytes = tuple(int(b, 16) for b in address.split(":"))
         self._connect_lock = asyncio.Lock()
+        self._connecting = False
+        self._connect_failures = 0
+        self._next_connect_attempt = 0.0
+        self._first_status = asyncio.Event()
+        self._bind_requested = asyncio.Event()
+        self._bind_accepted = asyncio.Event()
+        # Duration of each connection setup step
+        self.connect_phases: dict[str, LatencyStats] = {
+            phase: LatencyStats()
+            for phase in ("connect", "notify", "first_status", "bind")
+        }
+        self.write_latency = LatencyStats()
+        # Successful connects, failed attempts and drops we did not ask for
+        self.connects = 0
+        self.connects_failed = 0
+        self.unexpected_disconnects = 0
+        # Frames without the AA header and status frames too short to decode
+        self.frames_malformed = 0
+        self.decode_errors = 0
+        self.frame_log = FrameLog(FRAME_LOG_SIZE, FRAME_SLOT_SIZE)
+        self.capture: CaptureWriter | None = None
+        # Hot path timings, sampled into perf for the diagnostic sensors
+        self.parse_time = LatencyStats()
+        self.publish_latency = LatencyStats()
+        self.perf: dict[str, float | int | None] = {}
+        self._perf_means = {
+            "parse_time": IntervalMean(self.parse_time),
+            "publish_latency": IntervalMean(self.publish_latency),
+            "write_latency": IntervalMean(self.write_latency),
+        }
+        self._perf_frames = 0
+        self._perf_sampled_at = time.monotonic()
+        self._perf_logged_at = self._perf_sampled_at
+        self._commands = CommandQueue(
+            hass, self._write, COMMAND_INTERVAL, COMMAND_ACK_TIMEOUT, COMMAND_RETRIES
+        )
+        stream_interval = entry.options.get(
+            CONF_STREAM_INTERVAL, DEFAULT_STREAM_INTERVAL
+        )
+        self._stream_cmd = cached_cmd(
+            CMD_AUTO_UPDATA,
+            AUTO_UPDATA_MODE,
+            round(stream_interval * 10),
+            AUTO_UPDATA_COUNT,
+        )
+        self._coalesce_window = (
+            entry.options.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW) / 1000
+        )
+        self._coalesce_unsub: CALLBACK_TYPE | None = None
+        self._pending_fields: set[str] = set()
+        self._pending_status = False
+        self._last_publish = 0.0
+        # Status frames published to entities, dropped as unchanged,
+        # or merged into a later publish by the coalescing window
+        self.updates_delivered = 0
+        self.updates_suppressed = 0
+        self.updates_coalesced = 0
+        self._changed_fields: set[str] | None = None
+        self.telemetry = TelemetryBuffer(TELEMETRY_CAPACITY, TELEMETRY_SPACING)
+        # Liters per pump stroke
+        self._stroke_volume = (
+            entry.options.get(CONF_PUMP_STROKE_VOLUME, DEFAULT_PUMP_STROKE_VOLUME)
+            / 1000
+        )
+        self._totals_at = -TOTALIZER_MAX_GAP
+        self._last_pump_freq = 0.0
+        self._last_burning = False
+        self._published_totals = (0.0, 0.0)
+        self._restored_totals: set[str] = set()
+        self._overlay: dict[str, _Overlay] = {}
+        self._overlay_timeout = OPTIMISTIC_TIMEOUT + stream_interval
+        # Idle disconnect (0 timeout = keep the link up)
+        self._idle_timeout = (
+            entry.options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT) * 60
+            if entry.options.get(CONF_IDLE_DISCONNECT, DEFAULT_IDLE_DISCONNECT)
+            else 0
+        )
+        self._idle_refresh = (
+            entry.options.get(CONF_IDLE_REFRESH, DEFAULT_IDLE_REFRESH) * 60
+        )
+        self._idle = False
+        self._last_activity = time.monotonic()
+        self._last_status_at = 0.0
+        # Extra time the first command after an idle disconnect waits
+        self.idle_wake_latency = LatencyStats()
+        self._fast_interval = timedelta(
+            seconds=entry.options.get(CONF_FAST_INTERVAL, DEFAULT_FAST_INTERVAL)
+        )
+        self._run_interval = timedelta(
+            seconds=entry.options.get(CONF_RUN_INTERVAL, DEFAULT_RUN_INTERVAL)
+        )
+        self._slow_interval = timedelta(
+            seconds=entry.options.get(CONF_SLOW_INTERVAL, DEFAULT_SLOW_INTERVAL)
+        )
+        self._tick_interval = self._cadence()
+        self._unsub_tick: CALLBACK_TYPE | None = None
+        self._tick_task: asyncio.Task[None] | None = None
 
     async def _async_update_data(self) -> NordkappHeaterData:
         """Connect or send keepalive, return current data."""
         try:
-            if not self._connected:
-                await self._connect()
-            else:
-                await self._send_keepalive()
+            if self._connected:
+                if self._idle_due():
+                    await self._async_idle_disconnect()
+                else:
+                    await self._send_keepalive()
+            elif (
+                not self._idle
+                or time.monotonic() - self._last_status_at >= self._idle_refresh
+            ):
+                await self._async_connect_with_backoff()
+                if self._idle and self._connected:
+                    if self._standby_quiet():
+                        # Scheduled refresh done, drop the link again
+                        await self._async_idle_disconnect()
+                    else:
+                        self._idle = False
         except Exception as err:
             _LOGGER.debug("Update error: %s", err)
             self._data.available = False
             await self._disconnect()
-        return self._data
+        return self._published_data()
 
-    async def _connect(self) -> None:
-        """Establish BLE connection, subscribe, start polling, bind."""
-        async with self._connect_lock:
-            if self._connected:
-                return
+    def _restore_snapshot(self, snapshot: dict[str, Any]) -> None:
+        """Load the last known state, marked stale until the heater reports."""
+        current = self._data.__dict__
+        current.update(
+            (name, value)
+            for name, value in snapshot.items()
+            if name in current and name not in SNAPSHOT_EXCLUDED
+        )
+        if (start := self._data.scheduled_start) is not None:
+            start = dt_util.parse_datetime(start)
+            # A start that came due while Home Assistant was down has run
+            self._data.scheduled_start = (
+                start if start is not None and start > dt_util.utcnow() else None
+            )
+        self._data.available = True
+        self._data.stale = True
+        self._stale_until = time.monotonic() + STALE_GRACE
 
-            device = async_ble_device_from_address(self.hass, self.address)
+    def _snapshot(self) -> dict[str, Any]:
+        """Return the state to persist as the last known snapshot."""
+        return {
+            name: value.isoformat() if isinstance(value, datetime) else value
+            for name, value in self._data.__dict__.items()
+            if name not in SNAPSHOT_EXCLUDED
+        }
 
-            try:
-                self._client = BleakClient(
-                    device if device else self.address,
-                    timeout=30.0,
-                    disconnected_callback=self._handle_disconnect,
-                )
-                await self._client.connect()
-            except (BleakError, TimeoutError, OSError) as err:
-                _LOGGER.debug("Cannot connect to %s: %s", self.address, err)
-                self._client = None
-                self._data.available = False
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Publish the restored state and connect in the background.
+
+        Setup does not wait for the heater: entities start from the last
+        known snapshot. Reconnects as soon as the heater advertises.
+        Returns a callback that stops all of it.
+        """
+        self.data = self._published_data()
+        self.entry.async_create_background_task(
+            self.hass, self.async_refresh(), f"nordkapp_heater connect {self.address}"
+        )
+        unsub_snapshot = self._snapshots.async_track(self.address, self._snapshot)
+        unsub_advertisement = async_register_callback(
+            self.hass,
+            self._async_handle_advertisement,
+            BluetoothCallbackMatcher(address=self.address, connectable=True),
+            BluetoothScanningMode.ACTIVE,
+        )
+        unsub_perf = async_track_time_interval(
+            self.hass,
+            self._async_sample_perf,
+            timedelta(seconds=PERF_SAMPLE_INTERVAL),
+        )
+        self._arm_tick()
+
+        @callback
+        def _unsub() -> None:
+            unsub_advertisement()
+            unsub_perf()
+            unsub_snapshot()
+            if self._unsub_tick is not None:
+                self._unsub_tick()
+                self._unsub_tick = None
+
+        return _unsub
+
+    @callback
+    def _arm_tick(self) -> None:
+        """(Re)start the link timer at the current cadence."""
+        if self._unsub_tick is not None:
+            self._unsub_tick()
+        self._unsub_tick = async_track_time_interval(
+            self.hass, self._async_tick, self._tick_interval
+        )
+
+    @callback
+    def _async_tick(self, _now: datetime) -> None:
+        """Refresh on the cadence: keepalive, idle disconnect or reconnect.
+
+        A fixed timer, unlike the coordinator's poll, which every status
+        publish reschedules and which never came due while frames flowed.
+        """
+        if self._tick_task is not None and not self._tick_task.done():
+            return
+        self._tick_task = self.entry.async_create_background_task(
+            self.hass, self.async_refresh(), f"nordkapp_heater tick {self.address}"
+        )
+
+    @callback
+    def _async_sample_perf(self, _now: datetime) -> None:
+        """Sample the hot path counters and push them to the perf sensors."""
+        now = time.monotonic()
+        frames = self.frame_log.total
+        self.perf = {
+            "frame_rate": (frames - self._perf_frames)
+            / (now - self._perf_sampled_at),
+            **{name: mean.take() for name, mean in self._perf_means.items()},
+            "dropped_frames": self.frames_malformed + self.decode_errors,
+        }
+        self._perf_frames = frames
+        self._perf_sampled_at = now
+        self._changed_fields = {"perf"}
+        self.async_update_listeners()
+
+        if (
+            _LOGGER.isEnabledFor(logging.DEBUG)
+            and now - self._perf_logged_at >= PERF_LOG_INTERVAL
+        ):
+            self._perf_logged_at = now
+            _LOGGER.debug(
+                "%s hot path: %d frames (%.2f/s), %d dropped, parse %.0f/%.0f us,"
+                " publish %.1f/%.1f ms, write %.1f/%.1f ms (mean/max)",
+                self.address,
+                frames,
+                self.perf["frame_rate"],
+                self.perf["dropped_frames"],
+                self.parse_time.mean * 1e6,
+                self.parse_time.max * 1e6,
+                self.publish_latency.mean * 1000,
+                self.publish_latency.max * 1000,
+                self.write_latency.mean * 1000,
+                self.write_latency.max * 1000,
+            )
+
+    @callback
+    def _async_handle_advertisement(
+        self, _service_info: BluetoothServiceInfoBleak, _change: BluetoothChange
+    ) -> None:
+        """Heater advertises only while powered, so connect right away."""
+        if (
+            self._idle
+            or self._connected
+            or self._connecting
+            or time.monotonic() < self._next_connect_attempt
+        ):
+            return
+        self.entry.async_create_background_task(
+            self.hass,
+            self._async_connect_with_backoff(),
+            f"nordkapp_heater reconnect {self.address}",
+        )
+
+    async def _async_connect_with_backoff(self) -> None:
+        """Connect unless a previous failure is still backing off."""
+        if time.monotonic() < self._next_connect_attempt:
+            return
+        try:
+            await self._connect()
+        except Exception as err:
+            _LOGGER.debug("Setup of %s failed: %s", self.address, err)
+            self._data.available = False
+            await self._disconnect()
+            self._connect_failed()
+
+    def _connect_failed(self) -> None:
+        """Back off exponentially before the next connect attempt."""
+        self._connect_failures += 1
+        self.connects_failed += 1
+        delay = min(
+            RECONNECT_BACKOFF_MAX,
+            RECONNECT_BACKOFF_MIN * 2 ** (self._connect_failures - 1),
+        )
+        self._next_connect_attempt = time.monotonic() + delay
+        _LOGGER.debug("Next connect attempt to %s in %.0fs", self.address, delay)
+
+    @property
+    def connected(self) -> bool:
+        """Return True while a BLE connection is up."""
+        return self._connected
+
+    @property
+    def running(self) -> bool:
+        """Return True if the heater was last reported running."""
+        return self._data.machine_status in RUNNING_STATES
+
+    @property
+    def slot_preemptible(self) -> bool:
+        """Return True if the connection slot may be handed to another heater."""
+        return self._connected and not self.running and self._commands.idle
+
+    @callback
+    def async_release_slot(self) -> None:
+        """Disconnect so the broker can hand the slot to another heater."""
+        self.entry.async_create_background_task(
+            self.hass, self._disconnect(), f"nordkapp_heater release {self.address}"
+        )
+
+    def _standby_quiet(self) -> bool:
+        """Return True if the heater is in standby with no command pending."""
+        return self._data.machine_status == STATE_STANDBY and self._commands.idle
+
+    def _idle_due(self) -> bool:
+        """Return True once the idle timeout has passed in standby."""
+        return (
+            bool(self._idle_timeout)
+            and self._standby_quiet()
+            and time.monotonic() - self._last_activity >= self._idle_timeout
+        )
+
+    async def _async_idle_disconnect(self) -> None:
+        """Drop the link while the heater idles in standby."""
+        _LOGGER.debug("%s idle in standby, disconnecting", self.address)
+        self._idle = True
+        await self._disconnect()
+
+    async def _async_ensure_connected(self) -> None:
+        """Connect right away for a user command, bypassing the backoff."""
+        self._last_activity = time.monotonic()
+        if self._connected:
+            return
+        started = time.monotonic()
+        try:
+            await self._connect(PRIORITY_COMMAND)
+        except Exception as err:
+            self._data.available = False
+            await self._disconnect()
+            raise HomeAssistantError(
+                f"Cannot connect to heater {self.address}: {err}"
+            ) from err
+        if not self._connected:
+            raise HomeAssistantError(f"Cannot connect to heater {self.address}")
+        if self._idle:
+            self._idle = False
+            self.idle_wake_latency.add(time.monotonic() - started)
+
+    async def _connect(self, priority: int | None = None) -> None:
+        """Take a connection slot, then connect, subscribe, start polling, bind.
+
+        The broker keeps one slot per heater, not per caller, so the slot
+        is taken and given back under the connect lock: a caller whose
+        attempt failed cannot release it while another one connects.
+        """
+        if self._connected:
+            return
+        if priority is None:
+            priority = PRIORITY_RUNNING if self.running else PRIORITY_STANDBY
+        self._connecting = True
+        try:
+            async with self._connect_lock:
+                if self._connected:
+                    return
+                try:
+                    await self._broker.async_acquire(
+                        self,
+                        priority,
+                        COMMAND_SLOT_TIMEOUT
+                        if priority == PRIORITY_COMMAND
+                        else SLOT_WAIT_TIMEOUT,
+                    )
+                except TimeoutError:
+                    _LOGGER.debug("No free connection slot for %s", self.address)
+                    return
+                try:
+                    await self._setup_connection()
+                finally:
+                    if not self._connected:
+                        self._broker.release(self)
+        finally:
+            self._connecting = False
+
+    async def _setup_connection(self) -> None:
+        """Establish BLE connection, subscribe, start polling, bind.
+
+        Runs under the connect lock with a connection slot held.
+        """
+        connect = self._client_factory
+        if connect is None:
+            if (device := self._ble_device()) is None:
+                _LOGGER.debug("%s not seen by any connectable scanner", self.address)
+                # Scanners need a moment after a restart, keep the
+                # restored state until a real attempt fails
+                if not self._data.stale or time.monotonic() >= self._stale_until:
+                    self._data.available = False
                 return
+            connect = partial(self._async_establish, device)
 
-            self._connected = True
-            _LOGGER.info("Connected to Nordkapp Heater %s", self.address)
+        self._first_status.clear()
+        self._bind_requested.clear()
+        self._bind_accepted.clear()
 
-            try:
-                await self._client.start_notify(
-                    SERVICE_CHANGED_UUID, lambda _s, _d: None
-                )
-            except (BleakError, Exception):
-                pass
+        started = time.monotonic()
+        try:
+            self._client = await connect(self.address, self._handle_disconnect)
+        except (BleakError, TimeoutError, OSError) as err:
+            _LOGGER.debug("Cannot connect to %s: %s", self.address, err)
+            self._client = None
+            self._data.available = False
+            self._connect_failed()
+            return
+        timings = {"connect": self._record_phase("connect", started)}
 
-            await self._client.start_notify(
-                NOTIFY_CHAR_UUID, self._handle_notification
+        self._connected = True
+        self.connects += 1
+        self._connect_failures = 0
+        self._next_connect_attempt = 0.0
+        _LOGGER.info("Connected to Nordkapp Heater %s", self.address)
+
+        step = time.monotonic()
+        try:
+            await self._client.start_notify(SERVICE_CHANGED_UUID, lambda _s, _d: None)
+        except (BleakError, Exception):
+            pass
+
+        try:
+            await self._client.start_notify(NOTIFY_CHAR_UUID, self._handle_notification)
+        except BleakError:
+            # Cached services may be stale, rediscover on next connect
+            await self._client.clear_cache()
+            raise
+        timings["notify"] = self._record_phase("notify", step)
+
+        # Start status polling, continue once the first frame arrives
+        await self._send(("stream",), self._stream_cmd)
+        timings["first_status"] = await self._wait_phase(
+            "first_status", self._first_status, FIRST_STATUS_TIMEOUT
+        )
+
+        # Proactive bind, unless the heater already asked for one
+        if not self._bind_accepted.is_set():
+            if not self._bind_requested.is_set():
+                await self._send_bind()
+            timings["bind"] = await self._wait_phase(
+                "bind", self._bind_accepted, BIND_TIMEOUT
             )
 
-            # Start status polling
-            await self._write(build_cmd(CMD_AUTO_UPDATA, 2, 20, 99))
-            await asyncio.sleep(2)
+        _LOGGER.debug(
+            "Setup of %s finished in %.2fs (%s)",
+            self.address,
+            time.monotonic() - started,
+            ", ".join(
+                f"{phase}={elapsed * 1000:.0f}ms"
+                if elapsed is not None
+                else f"{phase}=timeout"
+                for phase, elapsed in timings.items()
+            ),
+        )
+        self.entry.async_create_background_task(
+            self.hass,
+            self._async_read_device_registers(),
+            f"nordkapp_heater registers {self.address}",
+        )
+
+    async def _async_establish(
+        self,
+        device: BLEDevice,
+        address: str,
+        disconnected_callback: Callable[[BleakClient], None],
+    ) -> BleakClientWithServiceCache:
+        """Connect through bleak-retry-connector with cached services."""
+        return await establish_connection(
+            BleakClientWithServiceCache,
+            device,
+            address,
+            disconnected_callback=disconnected_callback,
+            max_attempts=CONNECT_ATTEMPTS,
+            ble_device_callback=lambda: self._ble_device() or device,
+        )
 
-            # Proactive bind
-            await self._send_bind()
+    def _record_phase(self, phase: str, started: float) -> float:
+        """Record the duration of a connection setup step."""
+        elapsed = time.monotonic() - started
+        self.connect_phases[phase].add(elapsed)
+        return elapsed
+
+    def _ble_device(self) -> BLEDevice | None:
+        """Return the freshest connectable BLEDevice for the heater."""
+        return async_ble_device_from_address(
+            self.hass, self.address, connectable=True
+        )
+
+    async def _wait_phase(
+        self, phase: str, event: asyncio.Event, timeout: float
+    ) -> float | None:
+        """Wait for a connection setup event, return its duration or None."""
+        started = time.monotonic()
+        try:
+            async with asyncio.timeout(timeout):
+                await event.wait()
+        except TimeoutError:
+            _LOGGER.debug(
+                "%s: no %s after %.1fs, continuing", self.address, phase, timeout
+            )
+            return None
+        return self._record_phase(phase, started)
 
     async def _disconnect(self) -> None:
         """Clean up BLE connection."""
         self._connected = False
         self._bound = False
-        if self._client:
-            try:
-                await self._client.disconnect()
-            except (BleakError, Exception):
-                pass
-            self._client = None
+        client, self._client = self._client, None
+        try:
+            if client:
+                await client.disconnect()
+        except (BleakError, Exception):
+            pass
+        finally:
+            # Only hand the slot on once the link is really down
+            self._broker.release(self)
 
-    def _handle_disconnect(self, _client: BleakClient) -> None:
+    def _handle_disconnect(self, client: BleakClient) -> None:
         """Called by bleak when connection drops."""
+        if client is not self._client:
+            # Disconnect we asked for, keep the last known state
+            return
         _LOGGER.info("Nordkapp Heater %s disconnected", self.address)
+        self.unexpected_disconnects += 1
+        self._client = None
         self._connected = False
         self._bound = False
         self._data.available = False
+        self._broker.release(self)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update listeners, limited to those depending on changed fields."""
+        changed = self._changed_fields
+        self._changed_fields = None
+        if changed is None:
+            super().async_update_listeners()
+            return
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or not changed.isdisjoint(context):
+                update_callback()
 
     @callback
     def _handle_notification(self, _sender: int, raw: bytearray) -> None:
         """Process incoming BLE notification."""
-        data = bytes(raw)
+        data = memoryview(raw)
+        now = time.monotonic()
+        self.frame_log.add(data, now)
+        if self.capture is not None:
+            self.capture.record(data, now)
         if len(data) < 3 or data[0] != 0xAA:
+            self.frames_malformed += 1
             return
 
         cmd = data[2]
 
-        if cmd == RESP_STATUS and len(data) >= STATUS_PACKET_MIN_LENGTH:
-            self._parse_status(data)
-            self.async_set_updated_data(self._data)
+        if cmd == RESP_STATUS:
+            if len(data) < STATUS_PACKET_MIN_LENGTH:
+                self.decode_errors += 1
+                return
+            self._first_status.set()
+            self._last_status_at = now
+            started = time.perf_counter()
+            changed = self._parse_status(data)
+            self.parse_time.add(time.perf_counter() - started)
+            self._accumulate_totals(now, changed)
+            self.telemetry.append(self._data, now)
+            if changed:
+                self._publish_status(changed, status=True)
+            else:
+                self.updates_suppressed += 1
         elif cmd == RESP_BIND_REQUEST:
             _LOGGER.debug("Bind request from heater")
+            self._bind_requested.set()
             self.hass.async_create_task(self._delayed_bind())
         elif cmd == RESP_BIND_ACCEPTED:
             _LOGGER.debug("Bind accepted")
             self._bound = True
-        elif cmd == RESP_CMD_ACK:
-            _LOGGER.debug("Command ACK: btn=%d", data[3] if len(data) > 3 else -1)
-        elif cmd == RESP_PARA:
-            _LOGGER.debug(
-                "Para response: type=%d val=%d",
-                data[3] if len(data) > 3 else -1,
-                data[5] if len(data) > 5 else -1,
-            )
+            self._bind_accepted.set()
+        elif cmd == RESP_CMD_ACK and len(data) > 4:
+            _LOGGER.debug("Command ACK: btn=%d nonce=%d", data[3], data[4])
+            # The nonce tells a late ACK of an earlier press from this one
+            self._commands.acknowledge(("button", data[3], data[4]))
+        elif cmd == RESP_REG_ADDR and len(data) > 5:
+            reply = self._register_reads.pop(data[3], None)
+            if reply is not None and not reply.done():
+                reply.set_result(data[4] | data[5] << 8)
+        elif cmd == RESP_PARA and len(data) > 5:
+            _LOGGER.debug("Para response: type=%d val=%d", data[3], data[5])
+            # A reply means the parameter was just written, which
+            # restarts the timer countdown
+            if (name := PARA_FIELDS.get(data[3])) is not None and (
+                changed := self._update_parameter(name, data[5], written=True)
+            ):
+                self._publish_status(changed)
+            self._commands.acknowledge(("para", data[3]))
+
+    @callback
+    def _publish_status(self, changed: set[str], status: bool = False) -> None:
+        """Publish changed fields, merging bursts within the coalescing window.
+
+        status marks fields decoded from a status frame, whose publish
+        latency is recorded.
+        """
+        if self._coalesce_window:
+            if self._coalesce_unsub is not None:
+                self._pending_fields |= changed
+                self._pending_status |= status
+                self.updates_coalesced += 1
+                return
+            delay = self._last_publish + self._coalesce_window - time.monotonic()
+            if delay > 0:
+                self._pending_fields = changed
+                self._pending_status = status
+                self._coalesce_unsub = async_call_later(
+                    self.hass, delay, self._async_flush_status
+                )
+                return
+        self._deliver_status(changed, status)
+
+    @callback
+    def _async_flush_status(self, _now: object) -> None:
+        """Publish fields collected during the coalescing window."""
+        self._coalesce_unsub = None
+        changed, status = self._pending_fields, self._pending_status
+        self._pending_fields = set()
+        self._pending_status = False
+        self._deliver_status(changed, status)
+
+    @callback
+    def _deliver_status(self, changed: set[str], status: bool = False) -> None:
+        """Push changed fields to subscribed entities.
+
+        Only status frame deliveries count towards publish_latency, which
+        is measured from the frame's arrival.
+        """
+        self._last_publish = time.monotonic()
+        self.updates_delivered += 1
+        self._changed_fields = changed
+        self.async_set_updated_data(self._published_data())
+        self._snapshots.async_schedule_save()
+        if status:
+            self.publish_latency.add(time.monotonic() - self._last_status_at)
+
+    def _published_data(self) -> NordkappHeaterData:
+        """Return heater data with pending optimistic values applied."""
+        if not self._overlay:
+            return self._data
+        return replace(
+            self._data,
+            **{name: overlay.value for name, overlay in self._overlay.items()},
+        )
+
+    @callback
+    def _set_overlay(self, name: str, value: Any) -> None:
+        """Show a commanded value right away, pending heater confirmation."""
+        if (old := self._overlay.pop(name, None)) is not None:
+            old.unsub_expire()
+        self._overlay[name] = _Overlay(
+            value,
+            async_call_later(
+                self.hass,
+                self._overlay_timeout,
+                partial(self._async_expire_overlay, name),
+            ),
+        )
+        self._deliver_status({name})
+
+    @callback
+    def _drop_overlay(self, name: str) -> bool:
+        """Remove an optimistic value, return True if one was pending."""
+        if (overlay := self._overlay.pop(name, None)) is None:
+            return False
+        overlay.unsub_expire()
+        return True
+
+    @callback
+    def _async_expire_overlay(self, name: str, _now: object) -> None:
+        """Roll back an optimistic value the heater never confirmed."""
+        if (overlay := self._overlay.pop(name, None)) is None:
+            return
+        _LOGGER.debug("%s=%s not confirmed, rolling back", name, overlay.value)
+        self._deliver_status({name})
+
+    def _reconcile_overlay(self, changed: set[str]) -> None:
+        """Drop optimistic values confirmed or contradicted by the heater."""
+        current = self._data.__dict__
+        now = time.monotonic()
+        for name, overlay in list(self._overlay.items()):
+            if current[name] == overlay.value:
+                self._drop_overlay(name)
+            elif (
+                overlay.acked_at is not None
+                and now - overlay.acked_at >= OPTIMISTIC_SETTLE
+            ):
+                _LOGGER.debug(
+                    "%s=%s contradicted by heater (%s), rolling back",
+                    name,
+                    overlay.value,
+                    current[name],
+                )
+                self._drop_overlay(name)
+                changed.add(name)
 
-    def _parse_status(self, data: bytes) -> None:
-        """Parse 52-byte status broadcast into data fields."""
-        d = self._data
-        d.available = True
+    @callback
+    def _update_parameter(
+        self, name: str, value: int, written: bool = False
+    ) -> set[str]:
+        """Store a parameter in the mirror, return the fields to publish."""
+        data = self._data
+        changed: set[str] = set()
+        if data.__dict__[name] != value:
+            data.__dict__[name] = value
+            changed.add(name)
+        overlay = self._overlay.get(name)
+        if overlay is not None and overlay.value == value:
+            # Confirmed, the published value does not change
+            self._drop_overlay(name)
+        if name == "timer" and (
+            written or changed or (value and data.scheduled_start is None)
+        ):
+            scheduled = dt_util.utcnow() + timedelta(hours=value) if value else None
+            if scheduled != data.scheduled_start:
+                data.scheduled_start = scheduled
+                changed.add("scheduled_start")
+        return changed
 
-        raw_status = data[8]
-        d.machine_status = raw_status & 0x0F
+    def _check_schedule(self, changed: set[str]) -> None:
+        """Clear the on-device schedule once the heater has started from it."""
+        data = self._data
+        if (
+            data.scheduled_start is not None
+            and data.machine_status in HEATING_STATES
+            and dt_util.utcnow() >= data.scheduled_start - SCHEDULE_TOLERANCE
+        ):
+            _LOGGER.debug("Scheduled start of %s ran", self.address)
+            data.scheduled_start = None
+            data.timer = 0
+            changed.update(("scheduled_start", "timer"))
 
-        running = data[9]
-        d.run_mode = (running >> 5) & 3
-        d.pump_active = (running & 0x03) != 0
-        d.fan_active = bool((running >> 2) & 1)
-        d.glow_plug_active = bool((running >> 3) & 1)
-        d.temp_unit_fahrenheit = bool((running >> 4) & 1)
+    def _parse_status(self, data: bytes | memoryview) -> set[str]:
+        """Parse 52-byte status broadcast, return the names of changed fields."""
+        values = decode_status(data)
+        values["available"] = True
+        values["stale"] = False
+        # Diff against the current snapshot, then one bulk update
+        current = self._data.__dict__
+        changed = {name for name, value in values.items() if current[name] != value}
+        current.update(values)
+        if "machine_status" in changed:
+            # Idle timeout counts from entering standby
+            self._last_activity = time.monotonic()
+            self._apply_cadence()
+            self._check_schedule(changed)
+        if self._overlay:
+            self._reconcile_overlay(changed)
+        return changed
 
-        d.voltage = le16(data, 10) / 10.0
-        d.altitude = le16(data, 12)
+    def _accumulate_totals(self, now: float, changed: set[str]) -> None:
+        """Integrate fuel use (trapezoid rule) and burner hours per frame."""
+        data = self._data
+        elapsed = now - self._totals_at
+        self._totals_at = now
+        if elapsed <= TOTALIZER_MAX_GAP:
+            data.fuel_used += (
+                (self._last_pump_freq + data.pump_freq) / 2
+                * elapsed
+                * self._stroke_volume
+            )
+            if self._last_burning:
+                data.run_hours += elapsed / 3600
+        self._last_pump_freq = data.pump_freq
+        self._last_burning = data.machine_status in HEATING_STATES
 
-        raw_ambient = le16(data, 14)
-        d.ambient_temp = le16s(data, 14) / 10.0 if raw_ambient != 32760 else None
+        # Publish totals in 1 ml and 36 s steps, not on every frame
+        totals = (round(data.fuel_used, 3), round(data.run_hours, 2))
+        if totals != self._published_totals:
+            if totals[0] != self._published_totals[0]:
+                changed.add("fuel_used")
+            if totals[1] != self._published_totals[1]:
+                changed.add("run_hours")
+            self._published_totals = totals
 
-        raw_shell = le16(data, 16)
-        d.shell_temp = le16s(data, 16) / 10.0 if raw_shell != 32760 else None
+    @callback
+    def async_restore_total(self, name: str, value: float) -> None:
+        """Add a total saved before the restart, once per field."""
+        if name in self._restored_totals:
+            return
+        self._restored_totals.add(name)
+        setattr(self._data, name, getattr(self._data, name) + value)
 
-        d.pump_freq = le16(data, 18) / 10.0
-        d.ignition_power = le16(data, 20) / 10.0
-        d.fan_rpm = le16(data, 22)
+    def _cadence(self) -> timedelta:
+        """Return the refresh interval for the current machine state."""
+        status = self._data.machine_status
+        if status in FAST_CADENCE_STATES:
+            return self._fast_interval
+        if status in SLOW_CADENCE_STATES:
+            return self._slow_interval
+        return self._run_interval
 
-        d.error_code = le16(data, 28)
-        d.gear = data[40]
-        d.target_temp = data[41]
+    def _apply_cadence(self) -> None:
+        """Match the refresh interval to the machine state, restart the timer."""
+        interval = self._cadence()
+        if interval != self._tick_interval:
+            _LOGGER.debug(
+                "%s refresh every %ss in state %d",
+                self.address,
+                interval.total_seconds(),
+                self._data.machine_status,
+            )
+            self._tick_interval = interval
+            if self._unsub_tick is not None:
+                self._arm_tick()
 
     async def _delayed_bind(self) -> None:
         """Respond to bind request after 500ms delay (APK behavior)."""
-        await asyncio.sleep(0.5)
+        await asyncio.sleep(BIND_DELAY)
         await self._send_bind()
 
     async def _send_bind(self) -> None:
@@ -231,57 +1052,251 @@ class NordkappHeaterCoordinator(DataUpdateCoordinator[NordkappHeaterData]):
         if not self._connected or not self._client:
             return
         try:
-            cmd = build_bind_response(self._mac_bytes)
-            await self._write(cmd)
+            cmd = cached_bind_response(self._mac_bytes)
+            await self._send(("bind",), cmd)
             _LOGGER.debug("Bind response sent")
         except (BleakError, Exception) as err:
             _LOGGER.debug("Bind failed: %s", err)
 
     async def _send_keepalive(self) -> None:
         """Send AUTO_UPDATA keepalive."""
-        await self._write(build_cmd(CMD_AUTO_UPDATA, 2, 20, 99))
+        await self._send(("stream",), self._stream_cmd)
+
+    async def _send(
+        self,
+        key: tuple[int | str, ...],
+        cmd: bytes,
+        ack: tuple[int | str, ...] | None = None,
+    ) -> None:
+        """Queue a command, merging it with a pending one of the same key.
+
+        With an ack key, wait for the heater reply matching it (RESP_CMD_ACK
+        with the nonce for buttons, RESP_PARA for parameters), resending on
+        timeout.
+        """
+        await self._commands.submit(key, cmd, ack)
+
+    @property
+    def registers(self) -> dict[str, int]:
+        """Return the cached static registers of this heater."""
+        return self._register_cache.get(self.address)
+
+    async def _read_registers(self, registers: Iterable[int]) -> dict[int, int]:
+        """Read registers with all requests in flight at once.
+
+        Replies are matched to requests by the echoed register number.
+        Registers without a reply are requested again, the rest are left
+        out of the result, as are values outside REGISTER_RANGES.
+        """
+        values: dict[int, int] = {}
+        missing = list(dict.fromkeys(registers))
+        for _attempt in range(REGISTER_READ_RETRIES + 1):
+            if not missing:
+                break
+            replies: dict[int, asyncio.Future[int]] = {}
+            for register in missing:
+                reply = self._register_reads.get(register)
+                if reply is None or reply.done():
+                    reply = self.hass.loop.create_future()
+                    self._register_reads[register] = reply
+                replies[register] = reply
+            # Replies are registered first, writes go out back to back
+            await asyncio.gather(
+                *(
+                    self._commands.submit(
+                        ("register", register), cached_cmd(CMD_GET_REG_ADDR, register)
+                    )
+                    for register in missing
+                )
+            )
+            await asyncio.wait(replies.values(), timeout=REGISTER_READ_TIMEOUT)
+            for register, reply in replies.items():
+                if reply.done() and not reply.cancelled():
+                    values[register] = reply.result()
+            missing = [register for register in missing if register not in values]
+        for register in missing:
+            if (reply := self._register_reads.pop(register, None)) is not None:
+                reply.cancel()
+        for register, value in list(values.items()):
+            low, high = REGISTER_RANGES[register]
+            if not low <= value <= high:
+                _LOGGER.debug(
+                    "%s: register 0x%02x reads %d, outside %d-%d, ignored",
+                    self.address,
+                    register,
+                    value,
+                    low,
+                    high,
+                )
+                del values[register]
+        return values
+
+    async def _async_read_device_registers(self) -> None:
+        """Read uncached static registers and the parameter mirror.
+
+        Both go out as one pipelined batch after every bind. The
+        parameters are read every time, they change on the heater too.
+        """
+        cached = self.registers
+        wanted = {
+            name: register
+            for name, register in STATIC_REGISTERS.items()
+            if name not in cached
+        }
+        try:
+            values = await self._read_registers(
+                [*wanted.values(), *PARA_REGISTERS.values()]
+            )
+        except (BleakError, HomeAssistantError) as err:
+            _LOGGER.debug("Reading registers of %s failed: %s", self.address, err)
+            return
+        changed: set[str] = set()
+        if found := {
+            name: values[register]
+            for name, register in wanted.items()
+            if register in values
+        }:
+            _LOGGER.debug("Registers of %s: %s", self.address, found)
+            self._register_cache.async_update(self.address, found)
+            changed.add("registers")
+        for para, register in PARA_REGISTERS.items():
+            if register in values:
+                changed |= self._update_parameter(
+                    PARA_FIELDS[para], values[register]
+                )
+        if changed:
+            self._publish_status(changed)
+
+    @property
+    def commands_merged(self) -> int:
+        """Return how many queued commands were merged into later ones."""
+        return self._commands.merged
 
-    async def _write(self, cmd: bytearray) -> None:
+    @property
+    def command_wait_time(self) -> LatencyStats:
+        """Return time commands spent in the queue."""
+        return self._commands.wait_time
+
+    @property
+    def command_ack_latency(self) -> dict[tuple[int | str, ...], LatencyStats]:
+        """Return round-trip time from write to heater reply, per command."""
+        return self._commands.ack_latency
+
+    async def _write(self, cmd: bytes) -> None:
         """Write command via BLE (writeNoResponse)."""
         if not self._client or not self._connected:
             raise BleakError("Not connected")
+        started = time.monotonic()
         await self._client.write_gatt_char(WRITE_CHAR_UUID, cmd, response=False)
+        self.write_latency.add(time.monotonic() - started)
+
+    async def _send_button(self, button: int) -> None:
+        """Send a CMD_BUTTON press with a random nonce."""
+        await self._async_ensure_connected()
+        rnd = random.randint(0, 254)
+        await self._send(
+            ("button", button),
+            cached_cmd(CMD_BUTTON, button, rnd, 0),
+            ack=("button", button, rnd),
+        )
+
+    async def _send_para(self, para: int, value: int) -> None:
+        """Send a CMD_SHORT_PARA write."""
+        await self._async_ensure_connected()
+        await self._send(
+            ("para", para),
+            cached_cmd(CMD_SHORT_PARA, para, 0, value),
+            ack=("para", para),
+        )
+
+    async def _send_para_optimistic(self, para: int, name: str, value: int) -> None:
+        """Send a SHORT_PARA write, showing the new value until confirmed."""
+        self._set_overlay(name, value)
+        try:
+            await self._send_para(para, value)
+        except Exception:
+            if self._drop_overlay(name):
+                self._deliver_status({name})
+            raise
+        overlay = self._overlay.get(name)
+        if overlay is not None and overlay.value == value:
+            overlay.acked_at = time.monotonic()
 
     # --- Public command methods ---
 
     async def async_power_on(self) -> None:
         """Send power ON command."""
-        rnd = random.randint(0, 254)
-        await self._write(build_cmd(CMD_BUTTON, BTN_POWER_ON, rnd, 0))
+        await self._send_button(BTN_POWER_ON)
 
     async def async_power_off(self) -> None:
         """Send power OFF command."""
-        rnd = random.randint(0, 254)
-        await self._write(build_cmd(CMD_BUTTON, BTN_POWER_OFF, rnd, 0))
+        await self._send_button(BTN_POWER_OFF)
 
     async def async_set_temperature(self, temp: int) -> None:
         """Set target temperature in Celsius."""
-        await self._write(build_cmd(CMD_SHORT_PARA, PARA_TARGET_TEMP, 0, temp))
+        await self._send_para_optimistic(PARA_TARGET_TEMP, "target_temp", temp)
 
     async def async_set_gear(self, gear: int) -> None:
         """Set gear level (1-10)."""
-        await self._write(build_cmd(CMD_SHORT_PARA, PARA_TARGET_GEAR, 0, gear))
+        await self._send_para_optimistic(PARA_TARGET_GEAR, "gear", gear)
 
     async def async_set_mode(self, mode: int) -> None:
         """Set run mode (0=auto, 1=manual, 2=start-stop)."""
-        await self._write(build_cmd(CMD_SHORT_PARA, PARA_RUN_MODE, 0, mode))
+        await self._send_para_optimistic(PARA_RUN_MODE, "run_mode", mode)
+
+    async def async_set_timer(self, hours: int) -> None:
+        """Set the start timer in hours (0 = off)."""
+        await self._send_para_optimistic(PARA_TIMER, "timer", hours)
+
+    async def async_schedule_run(self, hours: int) -> datetime | None:
+        """Program the heater to start itself in hours (0 cancels).
+
+        The heater runs the schedule on its own timer, so no connection
+        is needed when it comes due. Returns the expected start time.
+        """
+        await self.async_set_timer(hours)
+        return self._data.scheduled_start
+
+    async def async_set_temp_diff(self, diff: int) -> None:
+        """Set the start-stop temperature difference in Celsius."""
+        await self._send_para_optimistic(PARA_TEMP_DIFF, "temp_diff", diff)
 
     async def async_clear_error(self) -> None:
         """Send clear error command."""
-        rnd = random.randint(0, 254)
-        await self._write(build_cmd(CMD_BUTTON, BTN_CLEAR_ERROR, rnd, 0))
+        await self._send_button(BTN_CLEAR_ERROR)
 
     async def async_ventilation(self) -> None:
         """Send ventilation mode command."""
-        rnd = random.randint(0, 254)
-        await self._write(build_cmd(CMD_BUTTON, BTN_VENTILATION, rnd, 0))
+        await self._send_button(BTN_VENTILATION)
+
+    async def async_start_capture(self, path: Path) -> CaptureWriter:
+        """Start recording raw notifications to a capture file."""
+        await self.async_stop_capture()
+        capture = CaptureWriter(self.hass, path)
+        await capture.async_open()
+        self.capture = capture
+        _LOGGER.info("Capturing %s frames to %s", self.address, path)
+        return capture
+
+    async def async_stop_capture(self) -> CaptureWriter | None:
+        """Stop recording, return the finished capture if one was running."""
+        if (capture := self.capture) is None:
+            return None
+        self.capture = None
+        await capture.async_close()
+        _LOGGER.info(
+            "Captured %d %s frames to %s", capture.frames, self.address, capture.path
+        )
+        return capture
 
     async def async_shutdown(self) -> None:
         """Disconnect on coordinator shutdown."""
+        await self.async_stop_capture()
+        if self._coalesce_unsub is not None:
+            self._coalesce_unsub()
+            self._coalesce_unsub = None
+        for name in list(self._overlay):
+            self._drop_overlay(name)
+        await self._commands.async_stop()
         await self._disconnect()
         await super().async_shutdown()
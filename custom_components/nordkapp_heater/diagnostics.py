@@ -0,0 +1,76 @@
+"""Diagnostics support for Nordkapp Heater."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_BROKER, DOMAIN
+from .coordinator import NordkappHeaterCoordinator
+
+# Heater MACs, also part of default capture file names
+TO_REDACT = {"address", "path"}
+
+
+def _redact_slots(slots: dict[str, Any], address: str) -> dict[str, Any]:
+    """Replace heater MACs in the slot broker state with stable labels."""
+    labels: dict[str, str] = {address: "self"}
+
+    def label(mac: str) -> str:
+        return labels.setdefault(mac, f"heater_{len(labels)}")
+
+    return {
+        **slots,
+        "holders": {label(mac): held for mac, held in slots["holders"].items()},
+        "waiting": [label(mac) for mac in slots["waiting"]],
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: NordkappHeaterCoordinator = hass.data[DOMAIN][entry.entry_id]
+    diagnostics = {
+        "address": coordinator.address,
+        "options": dict(entry.options),
+        "connected": coordinator.connected,
+        "data": asdict(coordinator.data) if coordinator.data else None,
+        "registers": coordinator.registers,
+        "connections": {
+            "connects": coordinator.connects,
+            "connects_failed": coordinator.connects_failed,
+            "unexpected_disconnects": coordinator.unexpected_disconnects,
+        },
+        "latency": {
+            **{
+                phase: stats.as_dict()
+                for phase, stats in coordinator.connect_phases.items()
+            },
+            "write": coordinator.write_latency.as_dict(),
+            "command_queue": coordinator.command_wait_time.as_dict(),
+            "idle_wake": coordinator.idle_wake_latency.as_dict(),
+            "command_ack": {
+                "/".join(map(str, key)): stats.as_dict()
+                for key, stats in coordinator.command_ack_latency.items()
+            },
+        },
+        "frames": {
+            "received": coordinator.frame_log.total,
+            "malformed": coordinator.frames_malformed,
+            "decode_errors": coordinator.decode_errors,
+            "updates_delivered": coordinator.updates_delivered,
+            "updates_suppressed": coordinator.updates_suppressed,
+            "updates_coalesced": coordinator.updates_coalesced,
+            "recent": coordinator.frame_log.as_list(),
+        },
+        "capture": coordinator.capture.as_dict() if coordinator.capture else None,
+        "connection_slots": _redact_slots(
+            hass.data[DATA_BROKER].as_dict(), coordinator.address
+        ),
+    }
+    return async_redact_data(diagnostics, TO_REDACT)
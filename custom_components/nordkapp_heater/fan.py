@@ -12,7 +12,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, GEAR_MAX, GEAR_MIN, MODE_AUTO, MODE_MANUAL, RUNNING_STATES
-from .coordinator import NordkappHeaterCoordinator
+from .coordinator import NordkappHeaterCoordinator, field_context
 
 
 async def async_setup_entry(
@@ -35,7 +35,9 @@ class NordkappHeaterFan(
     def __init__(
         self, coordinator: NordkappHeaterCoordinator, entry: ConfigEntry
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(
+            coordinator, field_context("machine_status", "run_mode", "gear")
+        )
         self._attr_unique_id = f"{entry.data['address']}_fan"
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, entry.data["address"])},
@@ -0,0 +1,127 @@
+"""Lightweight runtime metrics for Nordkapp Heater."""
+
+from __future__ import annotations
+
+import time
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+# Upper bucket bounds of latency histograms (milliseconds)
+HISTOGRAM_BOUNDS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+_HISTOGRAM_BOUNDS = tuple(bound / 1000 for bound in HISTOGRAM_BOUNDS_MS)
+_HISTOGRAM_LABELS = (
+    *(f"<={bound}ms" for bound in HISTOGRAM_BOUNDS_MS),
+    f">{HISTOGRAM_BOUNDS_MS[-1]}ms",
+)
+
+
+@dataclass
+class LatencyStats:
+    """Running latency statistics (seconds)."""
+
+    count: int = 0
+    total: float = 0.0
+    last: float = 0.0
+    max: float = 0.0
+    buckets: list[int] = field(
+        default_factory=lambda: [0] * len(_HISTOGRAM_LABELS), repr=False
+    )
+
+    def add(self, value: float) -> None:
+        """Record one sample."""
+        self.count += 1
+        self.total += value
+        self.last = value
+        self.max = max(self.max, value)
+        self.buckets[bisect_left(_HISTOGRAM_BOUNDS, value)] += 1
+
+    @property
+    def mean(self) -> float:
+        """Return the mean of all samples."""
+        return self.total / self.count if self.count else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics in milliseconds."""
+        return {
+            "count": self.count,
+            "last_ms": round(self.last * 1000, 1),
+            "mean_ms": round(self.mean * 1000, 1),
+            "max_ms": round(self.max * 1000, 1),
+            "histogram": {
+                label: count
+                for label, count in zip(_HISTOGRAM_LABELS, self.buckets)
+                if count
+            },
+        }
+
+
+class IntervalMean:
+    """Mean of the samples a LatencyStats received since the last take."""
+
+    def __init__(self, stats: LatencyStats) -> None:
+        self._stats = stats
+        self._count = 0
+        self._total = 0.0
+
+    def take(self) -> float | None:
+        """Return the mean since the previous call, None without samples."""
+        count = self._stats.count - self._count
+        total = self._stats.total - self._total
+        self._count = self._stats.count
+        self._total = self._stats.total
+        return total / count if count else None
+
+
+class FrameLog:
+    """Ring buffer of the most recent raw BLE frames.
+
+    Frames are copied into one preallocated bytearray with fixed-size
+    slots, so recording a frame allocates nothing. Hex formatting only
+    happens when the log is dumped. Frames longer than a slot are kept
+    truncated, with their full length recorded.
+    """
+
+    def __init__(self, capacity: int, slot_size: int) -> None:
+        self._capacity = capacity
+        self._slot_size = slot_size
+        self._buffer = bytearray(capacity * slot_size)
+        self._lengths = array("H", bytes(2 * capacity))
+        self._times = array("d", bytes(8 * capacity))
+        self._head = 0
+        self.total = 0
+
+    def add(self, data: memoryview, now: float) -> None:
+        """Record one frame received at monotonic time now."""
+        head = self._head
+        size = min(len(data), self._slot_size)
+        offset = head * self._slot_size
+        self._buffer[offset : offset + size] = data[:size]
+        self._lengths[head] = len(data)
+        self._times[head] = now
+        self._head = (head + 1) % self._capacity
+        self.total += 1
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return the logged frames, oldest first."""
+        wall_offset = time.time() - time.monotonic()
+        count = min(self.total, self._capacity)
+        frames = []
+        for index in range(self._head - count, self._head):
+            slot = index % self._capacity
+            length = self._lengths[slot]
+            offset = slot * self._slot_size
+            frame = self._buffer[offset : offset + min(length, self._slot_size)]
+            frames.append(
+                {
+                    "time": datetime.fromtimestamp(
+                        self._times[slot] + wall_offset, UTC
+                    ).isoformat(timespec="milliseconds"),
+                    "cmd": f"0x{frame[2]:02X}" if length > 2 else None,
+                    "length": length,
+                    "hex": frame.hex(" "),
+                }
+            )
+        return frames
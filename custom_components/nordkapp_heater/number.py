@@ -0,0 +1,110 @@
+"""Number platform for Nordkapp Heater (timer and start-stop parameters)."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.components.number import (
+    NumberDeviceClass,
+    NumberEntity,
+    NumberEntityDescription,
+    NumberMode,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTemperature, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN, TEMP_DIFF_MAX, TEMP_DIFF_MIN, TIMER_MAX, TIMER_MIN
+from .coordinator import (
+    NordkappHeaterCoordinator,
+    NordkappHeaterData,
+    field_context,
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class NordkappNumberDescription(NumberEntityDescription):
+    value_fn: Callable[[NordkappHeaterData], int | None]
+    set_fn: Callable[[NordkappHeaterCoordinator, int], Coroutine[Any, Any, None]]
+    data_fields: tuple[str, ...]
+
+
+NUMBERS: tuple[NordkappNumberDescription, ...] = (
+    NordkappNumberDescription(
+        key="timer",
+        translation_key="timer",
+        icon="mdi:timer-outline",
+        device_class=NumberDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        native_min_value=TIMER_MIN,
+        native_max_value=TIMER_MAX,
+        native_step=1,
+        mode=NumberMode.BOX,
+        value_fn=lambda d: d.timer,
+        set_fn=lambda c, value: c.async_set_timer(value),
+        data_fields=("timer",),
+    ),
+    NordkappNumberDescription(
+        key="temp_diff",
+        translation_key="temp_diff",
+        icon="mdi:thermometer-lines",
+        # A temperature difference, not converted like a temperature
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        native_min_value=TEMP_DIFF_MIN,
+        native_max_value=TEMP_DIFF_MAX,
+        native_step=1,
+        entity_category=EntityCategory.CONFIG,
+        value_fn=lambda d: d.temp_diff,
+        set_fn=lambda c, value: c.async_set_temp_diff(value),
+        data_fields=("temp_diff",),
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    coordinator: NordkappHeaterCoordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities(
+        NordkappHeaterNumber(coordinator, entry, desc) for desc in NUMBERS
+    )
+
+
+class NordkappHeaterNumber(
+    CoordinatorEntity[NordkappHeaterCoordinator], NumberEntity
+):
+    """Heater parameter, read from the coordinator's parameter mirror."""
+
+    _attr_has_entity_name = True
+    entity_description: NordkappNumberDescription
+
+    def __init__(
+        self,
+        coordinator: NordkappHeaterCoordinator,
+        entry: ConfigEntry,
+        description: NordkappNumberDescription,
+    ) -> None:
+        super().__init__(coordinator, field_context(*description.data_fields))
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.data['address']}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.data["address"])},
+        )
+
+    @property
+    def available(self) -> bool:
+        return super().available and self.coordinator.data.available
+
+    @property
+    def native_value(self) -> int | None:
+        return self.entity_description.value_fn(self.coordinator.data)
+
+    async def async_set_native_value(self, value: float) -> None:
+        await self.entity_description.set_fn(self.coordinator, int(value))
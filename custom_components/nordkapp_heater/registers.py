@@ -0,0 +1,53 @@
+"""Persistent cache of static heater registers for Nordkapp Heater."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, REGISTER_LAYOUT
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.registers"
+# Coalesce saves from several heaters finishing their reads together
+SAVE_DELAY = 10  # seconds
+
+
+class RegisterCache:
+    """Register values that never change, stored per heater MAC.
+
+    One Store holds every heater, so each device is read once and not
+    on every connect or restart. Values cached under another
+    REGISTER_LAYOUT are dropped on load.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        self._data: dict[str, dict[str, int]] = {}
+
+    async def async_load(self) -> None:
+        """Load cached registers from disk."""
+        stored = await self._store.async_load() or {}
+        # Caches from before the layout key hold MACs at the top level
+        if stored.get("layout") == REGISTER_LAYOUT:
+            self._data = stored["heaters"]
+
+    def get(self, address: str) -> dict[str, int]:
+        """Return the cached registers of a heater."""
+        return self._data.get(address, {})
+
+    @callback
+    def async_update(self, address: str, values: dict[str, int]) -> None:
+        """Merge register values for a heater and schedule a save."""
+        self._data.setdefault(address, {}).update(values)
+        self._store.async_delay_save(
+            lambda: {"layout": REGISTER_LAYOUT, "heaters": self._data}, SAVE_DELAY
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all cached registers for diagnostics."""
+        return self._data
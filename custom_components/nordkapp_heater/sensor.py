@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
 
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
@@ -13,10 +17,13 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
+    EntityCategory,
     UnitOfElectricPotential,
     UnitOfFrequency,
     UnitOfLength,
     UnitOfTemperature,
+    UnitOfTime,
+    UnitOfVolume,
 )
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
@@ -24,12 +31,22 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, MACHINE_STATUS
-from .coordinator import NordkappHeaterCoordinator, NordkappHeaterData
+from .coordinator import (
+    NordkappHeaterCoordinator,
+    NordkappHeaterData,
+    field_context,
+)
 
 
 @dataclass(frozen=True, kw_only=True)
 class NordkappSensorDescription(SensorEntityDescription):
-    value_fn: Callable[[NordkappHeaterData], float | int | str | None]
+    value_fn: Callable[
+        [NordkappHeaterData], float | int | str | datetime | None
+    ]
+    data_fields: tuple[str, ...]
+    attributes_fn: (
+        Callable[[NordkappHeaterCoordinator], Mapping[str, Any]] | None
+    ) = None
 
 
 SENSORS: tuple[NordkappSensorDescription, ...] = (
@@ -40,6 +57,7 @@ SENSORS: tuple[NordkappSensorDescription, ...] = (
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
         value_fn=lambda d: d.ambient_temp,
+        data_fields=("ambient_temp",),
     ),
     NordkappSensorDescription(
         key="shell_temp",
@@ -48,6 +66,7 @@ SENSORS: tuple[NordkappSensorDescription, ...] = (
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
         value_fn=lambda d: d.shell_temp,
+        data_fields=("shell_temp",),
     ),
     NordkappSensorDescription(
         key="voltage",
@@ -56,6 +75,7 @@ SENSORS: tuple[NordkappSensorDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricPotential.VOLT,
         state_class=SensorStateClass.MEASUREMENT,
         value_fn=lambda d: d.voltage,
+        data_fields=("voltage",),
     ),
     NordkappSensorDescription(
         key="fan_rpm",
@@ -64,6 +84,7 @@ SENSORS: tuple[NordkappSensorDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         icon="mdi:fan",
         value_fn=lambda d: d.fan_rpm,
+        data_fields=("fan_rpm",),
     ),
     NordkappSensorDescription(
         key="pump_freq",
@@ -72,18 +93,23 @@ SENSORS: tuple[NordkappSensorDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         icon="mdi:pump",
         value_fn=lambda d: d.pump_freq,
+        data_fields=("pump_freq",),
     ),
     NordkappSensorDescription(
         key="heater_state",
         translation_key="heater_state",
         icon="mdi:radiator",
         value_fn=lambda d: MACHINE_STATUS.get(d.machine_status, "unknown"),
+        data_fields=("machine_status", "registers"),
+        # Static registers read once per device
+        attributes_fn=lambda coordinator: coordinator.registers,
     ),
     NordkappSensorDescription(
         key="error_code",
         translation_key="error_code",
         icon="mdi:alert-circle-outline",
         value_fn=lambda d: d.error_code,
+        data_fields=("error_code",),
     ),
     NordkappSensorDescription(
         key="altitude",
@@ -92,6 +118,7 @@ SENSORS: tuple[NordkappSensorDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         icon="mdi:altimeter",
         value_fn=lambda d: d.altitude,
+        data_fields=("altitude",),
     ),
     NordkappSensorDescription(
         key="target_temp",
@@ -100,6 +127,7 @@ SENSORS: tuple[NordkappSensorDescription, ...] = (
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
         value_fn=lambda d: float(d.target_temp) if d.target_temp else None,
+        data_fields=("target_temp",),
     ),
     NordkappSensorDescription(
         key="gear_level",
@@ -107,6 +135,94 @@ SENSORS: tuple[NordkappSensorDescription, ...] = (
         icon="mdi:speedometer",
         state_class=SensorStateClass.MEASUREMENT,
         value_fn=lambda d: d.gear,
+        data_fields=("gear",),
+    ),
+    NordkappSensorDescription(
+        key="scheduled_start",
+        translation_key="scheduled_start",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        icon="mdi:timer-play-outline",
+        value_fn=lambda d: d.scheduled_start,
+        data_fields=("scheduled_start",),
+    ),
+)
+
+# Totals integrated by the coordinator, restored across restarts
+TOTAL_SENSORS: tuple[NordkappSensorDescription, ...] = (
+    NordkappSensorDescription(
+        key="fuel_used",
+        translation_key="fuel_used",
+        device_class=SensorDeviceClass.VOLUME,
+        native_unit_of_measurement=UnitOfVolume.LITERS,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=2,
+        icon="mdi:fuel",
+        value_fn=lambda d: round(d.fuel_used, 3),
+        data_fields=("fuel_used",),
+    ),
+    NordkappSensorDescription(
+        key="run_hours",
+        translation_key="run_hours",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=1,
+        icon="mdi:fire-circle",
+        value_fn=lambda d: round(d.run_hours, 2),
+        data_fields=("run_hours",),
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class NordkappPerfSensorDescription(SensorEntityDescription):
+    scale: float = 1
+    entity_category: EntityCategory | None = EntityCategory.DIAGNOSTIC
+    entity_registry_enabled_default: bool = False
+
+
+# Hot path counters, keyed by NordkappHeaterCoordinator.perf (seconds)
+PERF_SENSORS: tuple[NordkappPerfSensorDescription, ...] = (
+    NordkappPerfSensorDescription(
+        key="frame_rate",
+        translation_key="frame_rate",
+        native_unit_of_measurement="frames/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        icon="mdi:bluetooth-transfer",
+    ),
+    NordkappPerfSensorDescription(
+        key="parse_time",
+        translation_key="parse_time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MICROSECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        scale=1e6,
+    ),
+    NordkappPerfSensorDescription(
+        key="publish_latency",
+        translation_key="publish_latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        scale=1000,
+    ),
+    NordkappPerfSensorDescription(
+        key="write_latency",
+        translation_key="write_latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        scale=1000,
+    ),
+    NordkappPerfSensorDescription(
+        key="dropped_frames",
+        translation_key="dropped_frames",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:alert-octagon-outline",
     ),
 )
 
@@ -118,7 +234,17 @@ async def async_setup_entry(
 ) -> None:
     coordinator: NordkappHeaterCoordinator = hass.data[DOMAIN][entry.entry_id]
     async_add_entities(
-        NordkappHeaterSensor(coordinator, entry, desc) for desc in SENSORS
+        [
+            *(NordkappHeaterSensor(coordinator, entry, desc) for desc in SENSORS),
+            *(
+                NordkappTotalSensor(coordinator, entry, desc)
+                for desc in TOTAL_SENSORS
+            ),
+            *(
+                NordkappPerfSensor(coordinator, entry, desc)
+                for desc in PERF_SENSORS
+            ),
+        ]
     )
 
 
@@ -134,7 +260,7 @@ class NordkappHeaterSensor(
         entry: ConfigEntry,
         description: NordkappSensorDescription,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, field_context(*description.data_fields))
         self.entity_description = description
         self._attr_unique_id = f"{entry.data['address']}_{description.key}"
         self._attr_device_info = DeviceInfo(
@@ -146,5 +272,55 @@ class NordkappHeaterSensor(
         return super().available and self.coordinator.data.available
 
     @property
-    def native_value(self) -> float | int | str | None:
+    def native_value(self) -> float | int | str | datetime | None:
         return self.entity_description.value_fn(self.coordinator.data)
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        if (attributes_fn := self.entity_description.attributes_fn) is None:
+            return None
+        return attributes_fn(self.coordinator)
+
+
+class NordkappTotalSensor(NordkappHeaterSensor, RestoreSensor):
+    """Totalizer that carries its value over Home Assistant restarts."""
+
+    async def async_added_to_hass(self) -> None:
+        if (
+            last := await self.async_get_last_sensor_data()
+        ) is not None and isinstance(last.native_value, (int, float, Decimal)):
+            self.coordinator.async_restore_total(
+                self.entity_description.key, float(last.native_value)
+            )
+        await super().async_added_to_hass()
+
+    @property
+    def available(self) -> bool:
+        return self.coordinator.last_update_success
+
+
+class NordkappPerfSensor(
+    CoordinatorEntity[NordkappHeaterCoordinator], SensorEntity
+):
+    _attr_has_entity_name = True
+    entity_description: NordkappPerfSensorDescription
+
+    def __init__(
+        self,
+        coordinator: NordkappHeaterCoordinator,
+        entry: ConfigEntry,
+        description: NordkappPerfSensorDescription,
+    ) -> None:
+        super().__init__(coordinator, field_context("perf"))
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.data['address']}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.data["address"])},
+        )
+
+    @property
+    def native_value(self) -> float | int | None:
+        value = self.coordinator.perf.get(self.entity_description.key)
+        if value is None:
+            return None
+        return value * self.entity_description.scale
@@ -0,0 +1,169 @@
+"""Services for Nordkapp Heater."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from pathlib import Path
+
+import voluptuous as vol
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .capture import CAPTURE_SUFFIX
+from .const import DOMAIN, TIMER_MAX
+from .coordinator import NordkappHeaterCoordinator
+from .telemetry import TELEMETRY_FIELDS
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_WINDOW = "window"
+ATTR_FIELDS = "fields"
+ATTR_PERCENTILES = "percentiles"
+ATTR_FILENAME = "filename"
+ATTR_START = "start"
+ATTR_DELAY = "delay"
+
+SERVICE_GET_STATISTICS = "get_statistics"
+SERVICE_START_CAPTURE = "start_capture"
+SERVICE_STOP_CAPTURE = "stop_capture"
+SERVICE_SCHEDULE_RUN = "schedule_run"
+
+GET_STATISTICS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_WINDOW, default=60): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=1440)
+        ),
+        vol.Optional(ATTR_FIELDS): vol.All(
+            cv.ensure_list, [vol.In(TELEMETRY_FIELDS)]
+        ),
+        vol.Optional(ATTR_PERCENTILES, default=[50, 95]): vol.All(
+            cv.ensure_list, [vol.All(vol.Coerce(float), vol.Range(min=0, max=100))]
+        ),
+    }
+)
+
+START_CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_FILENAME): vol.All(
+            cv.string, vol.Match(r"^[A-Za-z0-9_.-]+$")
+        ),
+    }
+)
+STOP_CAPTURE_SCHEMA = vol.Schema({vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string})
+
+SCHEDULE_RUN_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+            vol.Exclusive(ATTR_START, "when"): cv.datetime,
+            vol.Exclusive(ATTR_DELAY, "when"): cv.positive_time_period,
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_START, ATTR_DELAY),
+)
+
+
+def _get_coordinator(hass: HomeAssistant, entry_id: str) -> NordkappHeaterCoordinator:
+    """Return the coordinator of a loaded config entry."""
+    if (coordinator := hass.data.get(DOMAIN, {}).get(entry_id)) is None:
+        raise ServiceValidationError(f"Heater {entry_id} is not loaded")
+    return coordinator
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def _async_get_statistics(call: ServiceCall) -> ServiceResponse:
+        """Return windowed statistics from the telemetry history."""
+        coordinator = _get_coordinator(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+        return coordinator.telemetry.statistics(
+            call.data[ATTR_WINDOW] * 60,
+            call.data.get(ATTR_FIELDS),
+            call.data[ATTR_PERCENTILES],
+        )
+
+    async def _async_start_capture(call: ServiceCall) -> ServiceResponse:
+        """Start recording raw frames under <config>/nordkapp_heater."""
+        coordinator = _get_coordinator(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+        filename = call.data.get(ATTR_FILENAME) or (
+            f"{coordinator.address.replace(':', '')}_"
+            f"{dt_util.now():%Y%m%d_%H%M%S}"
+        )
+        path = Path(hass.config.path(DOMAIN, filename)).with_suffix(CAPTURE_SUFFIX)
+        capture = await coordinator.async_start_capture(path)
+        return capture.as_dict()
+
+    async def _async_stop_capture(call: ServiceCall) -> ServiceResponse:
+        """Stop recording raw frames."""
+        coordinator = _get_coordinator(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+        if (capture := await coordinator.async_stop_capture()) is None:
+            raise ServiceValidationError(
+                f"No capture is running for {coordinator.address}"
+            )
+        return capture.as_dict()
+
+    async def _async_schedule_run(call: ServiceCall) -> ServiceResponse:
+        """Program the heater's own start timer, a zero delay cancels it."""
+        coordinator = _get_coordinator(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+        if (start := call.data.get(ATTR_START)) is not None:
+            if start.tzinfo is None:
+                start = start.replace(tzinfo=dt_util.get_default_time_zone())
+            delay = start - dt_util.now()
+        else:
+            delay = call.data[ATTR_DELAY]
+        # The heater timer counts whole hours, only an explicit zero
+        # delay cancels
+        hours = round(delay / timedelta(hours=1))
+        if hours < 1 and delay:
+            raise ServiceValidationError(
+                "The heater timer counts whole hours, the start must be at "
+                "least 30 minutes away (a delay of zero cancels the schedule)"
+            )
+        if hours > TIMER_MAX:
+            raise ServiceValidationError(
+                f"The heater timer can start at most {TIMER_MAX} hours ahead"
+            )
+        scheduled = await coordinator.async_schedule_run(hours)
+        return {
+            "timer": hours,
+            "scheduled_start": scheduled.isoformat() if scheduled else None,
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_STATISTICS,
+        _async_get_statistics,
+        schema=GET_STATISTICS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_CAPTURE,
+        _async_start_capture,
+        schema=START_CAPTURE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_CAPTURE,
+        _async_stop_capture,
+        schema=STOP_CAPTURE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SCHEDULE_RUN,
+        _async_schedule_run,
+        schema=SCHEDULE_RUN_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,70 @@
+"""Persistent last known state of Nordkapp heaters."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.snapshots"
+# At most one write per minute however often the state changes, plus
+# the final write when Home Assistant stops
+SAVE_DELAY = 60  # seconds
+
+
+class SnapshotStore:
+    """Last known status of every heater, stored per heater MAC.
+
+    Tracked heaters are only serialized when the delayed save runs, so
+    marking the state dirty on every status change is cheap.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        self._data: dict[str, dict[str, Any]] = {}
+        self._sources: dict[str, Callable[[], dict[str, Any]]] = {}
+        self._save_pending = False
+
+    async def async_load(self) -> None:
+        """Load snapshots from disk."""
+        self._data = await self._store.async_load() or {}
+
+    def get(self, address: str) -> dict[str, Any] | None:
+        """Return the last stored state of a heater."""
+        return self._data.get(address)
+
+    @callback
+    def async_track(
+        self, address: str, source: Callable[[], dict[str, Any]]
+    ) -> CALLBACK_TYPE:
+        """Snapshot a heater from source on every save, return untrack."""
+        self._sources[address] = source
+
+        @callback
+        def _untrack() -> None:
+            if self._sources.pop(address, None) is not None:
+                self._data[address] = source()
+                self.async_schedule_save()
+
+        return _untrack
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Schedule a save unless one is already pending."""
+        if not self._save_pending:
+            self._save_pending = True
+            self._store.async_delay_save(self._snapshot, SAVE_DELAY)
+
+    def _snapshot(self) -> dict[str, dict[str, Any]]:
+        """Collect the current state of all tracked heaters."""
+        self._save_pending = False
+        for address, source in self._sources.items():
+            self._data[address] = source()
+        return self._data
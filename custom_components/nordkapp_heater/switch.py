@@ -10,7 +10,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, RUNNING_STATES
-from .coordinator import NordkappHeaterCoordinator
+from .coordinator import NordkappHeaterCoordinator, field_context
 
 
 async def async_setup_entry(
@@ -32,7 +32,7 @@ class NordkappHeaterSwitch(
     def __init__(
         self, coordinator: NordkappHeaterCoordinator, entry: ConfigEntry
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, field_context("machine_status"))
         self._attr_unique_id = f"{entry.data['address']}_switch"
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, entry.data["address"])},
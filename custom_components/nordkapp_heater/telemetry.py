@@ -0,0 +1,145 @@
+"""In-memory telemetry history for Nordkapp Heater."""
+
+from __future__ import annotations
+
+import math
+import time
+from array import array
+from typing import Any
+
+# Decoded status fields kept in the history
+TELEMETRY_FIELDS = (
+    "machine_status",
+    "ambient_temp",
+    "shell_temp",
+    "voltage",
+    "pump_freq",
+    "ignition_power",
+    "fan_rpm",
+    "gear",
+    "target_temp",
+    "altitude",
+)
+
+_NAN = math.nan
+
+
+class TelemetryBuffer:
+    """Fixed-capacity ring buffer of status samples, one array per field.
+
+    Columns are preallocated float32 arrays and a float64 array of
+    monotonic timestamps, so memory is fixed at construction and append
+    is O(1). Missing readings are stored as NaN and skipped by queries.
+
+    Samples are kept on a grid of min_spacing. A sample up to half the
+    spacing early still takes its grid slot, so a stream running at the
+    spacing keeps every frame despite jitter, and faster streams are
+    thinned to one sample per slot. After a gap the grid restarts.
+    """
+
+    def __init__(self, capacity: int, min_spacing: float = 0.0) -> None:
+        self.capacity = capacity
+        self._min_spacing = min_spacing
+        self._times = array("d", bytes(8 * capacity))
+        self._columns = {
+            name: array("f", [_NAN]) * capacity for name in TELEMETRY_FIELDS
+        }
+        self._head = 0
+        self._size = 0
+        self._next_due = -math.inf
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory held by the sample arrays."""
+        return sum(
+            column.itemsize * len(column)
+            for column in (self._times, *self._columns.values())
+        )
+
+    def append(self, data: Any, now: float | None = None) -> bool:
+        """Record a sample of data, return False if it came too soon."""
+        if now is None:
+            now = time.monotonic()
+        spacing = self._min_spacing
+        if now < self._next_due - spacing / 2:
+            return False
+        if now - self._next_due >= spacing:
+            self._next_due = now + spacing
+        else:
+            self._next_due += spacing
+        head = self._head
+        self._times[head] = now
+        for name, column in self._columns.items():
+            value = getattr(data, name)
+            column[head] = _NAN if value is None else value
+        self._head = (head + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+        return True
+
+    def _slot(self, index: int) -> int:
+        """Map a logical index (0 = oldest) to a physical slot."""
+        return (self._head - self._size + index) % self.capacity
+
+    def _window_start(self, since: float) -> int:
+        """Return the logical index of the first sample at or after since."""
+        low, high = 0, self._size
+        times = self._times
+        while low < high:
+            mid = (low + high) // 2
+            if times[self._slot(mid)] < since:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def _window(self, column: array, start: int) -> list[float]:
+        """Return the non-NaN values of column from logical index start."""
+        first = self._slot(start)
+        count = self._size - start
+        if first + count <= self.capacity:
+            values = column[first : first + count]
+        else:
+            values = column[first:] + column[: first + count - self.capacity]
+        return [value for value in values if not math.isnan(value)]
+
+    def statistics(
+        self,
+        window: float,
+        fields: list[str] | None = None,
+        percentiles: list[float] | None = None,
+        now: float | None = None,
+    ) -> dict[str, Any]:
+        """Return per-field statistics over the last window seconds."""
+        if now is None:
+            now = time.monotonic()
+        start = self._window_start(now - window)
+        result: dict[str, Any] = {"samples": self._size - start}
+        for name in fields or TELEMETRY_FIELDS:
+            values = self._window(self._columns[name], start)
+            if not values:
+                result[name] = None
+                continue
+            stats = {
+                "count": len(values),
+                "min": round(min(values), 2),
+                "max": round(max(values), 2),
+                "mean": round(sum(values) / len(values), 2),
+            }
+            if percentiles:
+                values.sort()
+                for pct in percentiles:
+                    stats[f"p{pct:g}"] = round(_percentile(values, pct), 2)
+            result[name] = stats
+        return result
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    """Return the linearly interpolated percentile of sorted values."""
+    rank = (len(values) - 1) * pct / 100
+    low = math.floor(rank)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (rank - low)
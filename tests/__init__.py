@@ -0,0 +1 @@
+"""Tests for the Nordkapp Heater integration."""
@@ -0,0 +1,177 @@
+"""Fixtures for Nordkapp Heater tests.
+
+Heaters are SimulatedHeater instances reached through FakeBleakClient,
+so nothing here needs Bluetooth hardware or a scanner.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator, Awaitable, Callable, Generator
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.nordkapp_heater.broker import ConnectionBroker
+from custom_components.nordkapp_heater.const import (
+    BTN_POWER_OFF,
+    BTN_POWER_ON,
+    CONF_STREAM_INTERVAL,
+    DATA_BROKER,
+    DOMAIN,
+    STANDBY_SLICE,
+    STREAM_INTERVAL_MAX,
+)
+from custom_components.nordkapp_heater.coordinator import (
+    NordkappHeaterCoordinator,
+)
+
+from .simulator import FakeRetryConnector, SimulatedHeater
+
+ADDRESS = "AA:BB:CC:DD:EE:01"
+CONNECT_TIMEOUT = 10.0  # seconds for simulated heaters to connect and bind
+
+type HeaterSetup = Callable[
+    ..., Awaitable[list[tuple[SimulatedHeater, NordkappHeaterCoordinator]]]
+]
+
+
+def heater_address(index: int) -> str:
+    """Return the MAC of the index-th simulated heater."""
+    return f"AA:BB:CC:DD:{index >> 8:02X}:{index & 0xFF:02X}"
+
+
+def recorded_frames() -> list[bytes]:
+    """Return status frames of a simulated heater walking through a run.
+
+    Standby, booting, igniting, running (with the ambient sensor lost
+    for a while), residual burn, back to standby, then an error.
+    """
+    heater = SimulatedHeater(ADDRESS, ambient_temp=-12.5)
+    frames = [heater.status_frame()]
+    heater._press(BTN_POWER_ON)
+    for second in range(150):
+        heater.advance(1.0)
+        if second == 60:
+            heater.ambient_temp = None
+        elif second == 90:
+            heater.ambient_temp = 4.0
+        frames.append(heater.status_frame())
+    heater.gear = 8
+    heater.run_mode = 1
+    heater.advance(1.0)
+    frames.append(heater.status_frame())
+    heater._press(BTN_POWER_OFF)
+    for _second in range(70):
+        heater.advance(1.0)
+        frames.append(heater.status_frame())
+    heater.fail(7)
+    heater.advance(1.0)
+    frames.append(heater.status_frame())
+    return frames
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Load custom_components/nordkapp_heater."""
+
+
+@pytest.fixture
+def mock_bluetooth_callbacks() -> Any:
+    """Skip advertisement tracking, simulated heaters are not scanned."""
+    with patch(
+        "custom_components.nordkapp_heater.coordinator.async_register_callback",
+        return_value=lambda: None,
+    ):
+        yield
+
+
+@pytest.fixture
+def fake_retry_connector() -> Generator[FakeRetryConnector]:
+    """Send coordinators without a client factory to simulated heaters.
+
+    establish_connection and the scanner lookup are replaced, so the
+    coordinator's own _async_establish runs. Add heaters by address.
+    """
+    connector = FakeRetryConnector({})
+    with (
+        patch(
+            "custom_components.nordkapp_heater.coordinator.establish_connection",
+            connector.establish_connection,
+        ),
+        patch(
+            "custom_components.nordkapp_heater.coordinator"
+            ".async_ble_device_from_address",
+            connector.ble_device,
+        ),
+    ):
+        yield connector
+
+
+@pytest.fixture
+async def setup_heaters(
+    hass: HomeAssistant, mock_bluetooth_callbacks: None
+) -> AsyncGenerator[HeaterSetup]:
+    """Return a function that sets up config entries for simulated heaters.
+
+    Each entry gets its own heater, passed to the coordinator as client
+    factory, and one connection slot, so every heater connects. The
+    status stream runs at its slowest rate to keep the loop quiet;
+    keyword arguments override the entry options.
+    """
+    hass.config.components.add("bluetooth")
+
+    async def _setup(
+        count: int, **options: Any
+    ) -> list[tuple[SimulatedHeater, NordkappHeaterCoordinator]]:
+        heaters = {
+            address: SimulatedHeater(address, seed=index)
+            for index, address in enumerate(map(heater_address, range(count)))
+        }
+
+        def _coordinator(
+            *args: Any, **kwargs: Any
+        ) -> NordkappHeaterCoordinator:
+            address = args[1]
+            return NordkappHeaterCoordinator(
+                *args, client_factory=heaters[address].async_connect, **kwargs
+            )
+
+        hass.data[DATA_BROKER] = ConnectionBroker(hass, count, STANDBY_SLICE)
+        entries = []
+        with patch(
+            "custom_components.nordkapp_heater.NordkappHeaterCoordinator",
+            _coordinator,
+        ):
+            for address in heaters:
+                entry = MockConfigEntry(
+                    domain=DOMAIN,
+                    data={"address": address},
+                    options={CONF_STREAM_INTERVAL: STREAM_INTERVAL_MAX, **options},
+                    unique_id=address,
+                )
+                entry.add_to_hass(hass)
+                assert await hass.config_entries.async_setup(entry.entry_id)
+                entries.append(entry)
+        await hass.async_block_till_done()
+
+        pairs = [
+            (heaters[entry.data["address"]], hass.data[DOMAIN][entry.entry_id])
+            for entry in entries
+        ]
+        async with asyncio.timeout(CONNECT_TIMEOUT):
+            while not all(
+                heater.bound and coordinator.connected for heater, coordinator in pairs
+            ):
+                await asyncio.sleep(0.05)
+        await hass.async_block_till_done()
+        return pairs
+
+    yield _setup
+
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
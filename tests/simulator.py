@@ -0,0 +1,502 @@
+"""Simulated Nordkapp heater for testing without Bluetooth hardware.
+
+Test support only, kept out of the integration package.
+
+SimulatedHeater speaks the protocol in const.py and hands out
+FakeBleakClient connections through async_connect, which matches the
+coordinator's ClientFactory:
+
+    heater = SimulatedHeater(address, latency=0.05, loss=0.01)
+    coordinator = NordkappHeaterCoordinator(
+        hass, address, entry, broker, client_factory=heater.async_connect
+    )
+
+Timing, packet loss and link drops are configurable, and a seeded
+random generator keeps runs reproducible.
+
+FakeRetryConnector stands in for bleak-retry-connector's
+establish_connection instead, so the coordinator's own connect path
+runs, service cache included.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from collections.abc import Callable
+from typing import Any
+
+from bleak import BleakError
+from bleak.backends.device import BLEDevice
+
+from custom_components.nordkapp_heater.const import (
+    BTN_CLEAR_ERROR,
+    BTN_POWER_OFF,
+    BTN_POWER_ON,
+    BTN_VENTILATION,
+    CMD_AUTO_UPDATA,
+    CMD_BIND,
+    CMD_BUTTON,
+    CMD_GET_REG_ADDR,
+    CMD_SHORT_PARA,
+    MODE_MANUAL,
+    NOTIFY_CHAR_UUID,
+    PARA_REGISTERS,
+    PARA_RUN_MODE,
+    PARA_TARGET_GEAR,
+    PARA_TARGET_TEMP,
+    RESP_BIND_ACCEPTED,
+    RESP_BIND_REJECTED,
+    RESP_BIND_REQUEST,
+    RESP_CMD_ACK,
+    RESP_PARA,
+    RESP_REG_ADDR,
+    RESP_STATUS,
+    RUNNING_STATES,
+    SENSOR_NA_VALUE,
+    STATE_STANDBY,
+    STATUS_FIELDS,
+    STATUS_PACKET_MIN_LENGTH,
+    STATUS_STRUCT,
+    WRITE_CHAR_UUID,
+    cached_bind_response,
+    crc16,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_BOOTING = 0
+STATE_IGNITING = 1
+STATE_AUTO_RUN = 2
+STATE_MANUAL_RUN = 3
+STATE_RESIDUAL_BURN = 4
+STATE_ERROR = 6
+STATE_VENTILATION = 8
+
+# Seconds spent in each transient state before moving on
+DEFAULT_PHASE_DURATIONS = {
+    STATE_BOOTING: 5.0,
+    STATE_IGNITING: 30.0,
+    STATE_RESIDUAL_BURN: 60.0,
+}
+
+# Register values answered to CMD_GET_REG_ADDR, unknown ones get no reply.
+# The parameter registers (timer off, 2 C start-stop difference) also
+# follow SHORT_PARA writes.
+DEFAULT_REGISTERS = {
+    0x00: 0x0103,
+    0x01: 0x0002,
+    0x02: 0x5002,
+    0x10: 22,
+    0x20: 0,
+    0x21: 2,
+}
+
+# Service discovery over a real link, skipped once the host has the
+# services cached
+DISCOVERY_TIME = 0.3  # seconds
+
+
+def _framed(cmd: int, arg0: int, arg1: int, arg2: int) -> bytearray:
+    """Return AA 00 cmd arg0 arg1 arg2 with a CRC16 trailer."""
+    pkt = bytearray((0xAA, 0x00, cmd, arg0, arg1, arg2, 0, 0))
+    crc = crc16(pkt, 6)
+    pkt[6] = crc >> 8
+    pkt[7] = crc & 0xFF
+    return pkt
+
+
+class FakeBleakClient:
+    """In-process stand-in for BleakClientWithServiceCache."""
+
+    def __init__(
+        self,
+        heater: SimulatedHeater,
+        address: str,
+        disconnected_callback: Callable[[Any], None],
+    ) -> None:
+        self.address = address
+        self._heater = heater
+        self._disconnected_callback = disconnected_callback
+        self._notify: Callable[[int, bytearray], None] | None = None
+        self.is_connected = True
+
+    async def start_notify(
+        self, uuid: str, callback: Callable[[int, bytearray], None]
+    ) -> None:
+        """Subscribe to notifications, only the status characteristic is live."""
+        if not self.is_connected:
+            raise BleakError("Not connected")
+        if uuid == NOTIFY_CHAR_UUID:
+            self._notify = callback
+
+    async def write_gatt_char(
+        self, uuid: str, data: bytes | bytearray, response: bool = False
+    ) -> None:
+        """Send a command to the simulated heater."""
+        if not self.is_connected:
+            raise BleakError("Not connected")
+        if uuid != WRITE_CHAR_UUID:
+            raise BleakError(f"Characteristic {uuid} is not writable")
+        self._heater.deliver(self._heater.receive, bytes(data))
+
+    async def clear_cache(self) -> bool:
+        """Forget the services cached for the heater."""
+        self._heater.services_cached = False
+        return True
+
+    async def disconnect(self) -> bool:
+        """Drop the link as the central."""
+        self.drop()
+        return True
+
+    def drop(self) -> None:
+        """Tear down the link and report it like bleak does."""
+        if not self.is_connected:
+            return
+        self.is_connected = False
+        self._heater.detach(self)
+        self._disconnected_callback(self)
+
+    def notify(self, frame: bytes) -> None:
+        """Hand a heater frame to the subscriber."""
+        if self.is_connected and self._notify is not None:
+            self._notify(0, bytearray(frame))
+
+
+class SimulatedHeater:
+    """Nordkapp/HeatGenie heater model driven by the BLE protocol.
+
+    The heater accepts one connection at a time. It streams status
+    frames after AUTO_UPDATA, asks for a bind on every new connection
+    until bound, answers register reads, acknowledges CMD_BUTTON and
+    SHORT_PARA, and walks standby -> booting -> igniting -> run ->
+    residual_burn -> standby.
+    Every frame in either direction is delayed by latency plus up to
+    jitter seconds and dropped with probability loss. Each status tick
+    drops the link with probability disconnect_rate, and each connect
+    attempt fails with probability connect_failure.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        loss: float = 0.0,
+        disconnect_rate: float = 0.0,
+        connect_failure: float = 0.0,
+        connect_time: float = 0.0,
+        phase_durations: dict[int, float] | None = None,
+        ambient_temp: float = 15.0,
+        registers: dict[int, int] | None = None,
+        seed: int | None = None,
+    ) -> None:
+        self.address = address
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.disconnect_rate = disconnect_rate
+        self.connect_failure = connect_failure
+        self.connect_time = connect_time
+        self.phase_durations = {**DEFAULT_PHASE_DURATIONS, **(phase_durations or {})}
+        self.registers = dict(DEFAULT_REGISTERS if registers is None else registers)
+        self._random = random.Random(seed)
+        self._mac = tuple(int(part, 16) for part in address.split(":"))
+        self._client: FakeBleakClient | None = None
+        self._stream: asyncio.Task[None] | None = None
+        self._stream_interval = 0.0
+        self._bind_asked = False
+        self._phase_left = 0.0
+        self.bound = False
+        # GATT services known to the host, see FakeRetryConnector
+        self.services_cached = False
+
+        self.machine_status = STATE_STANDBY
+        self.run_mode = 0
+        self.gear = 5
+        self.target_temp = 22
+        self.error_code = 0
+        self.voltage = 12.6
+        self.altitude = 120
+        self.ambient_temp: float | None = ambient_temp
+        self.shell_temp = ambient_temp
+        self.pump_freq = 0.0
+        self.ignition_power = 0.0
+        self.fan_rpm = 0
+
+        # Frames and writes seen, for load tests
+        self.frames_sent = 0
+        self.frames_lost = 0
+        self.commands_received = 0
+        self.connections = 0
+
+    @property
+    def connected(self) -> bool:
+        """Return True while a client is attached."""
+        return self._client is not None
+
+    async def async_connect(
+        self, address: str, disconnected_callback: Callable[[Any], None]
+    ) -> FakeBleakClient:
+        """Open a connection, usable as the coordinator's client factory."""
+        if self.connect_time:
+            await asyncio.sleep(self.connect_time)
+        if address != self.address:
+            raise BleakError(f"Device with address {address} was not found")
+        if self._client is not None:
+            raise BleakError(f"{address} is already connected")
+        if self._random.random() < self.connect_failure:
+            raise BleakError(f"Simulated connection failure to {address}")
+        self._client = FakeBleakClient(self, address, disconnected_callback)
+        self._bind_asked = False
+        self.connections += 1
+        return self._client
+
+    def detach(self, client: FakeBleakClient) -> None:
+        """Forget a client once its link is down."""
+        if client is self._client:
+            self._client = None
+            if self._stream is not None:
+                self._stream.cancel()
+                self._stream = None
+
+    def drop_connection(self) -> None:
+        """Drop the link from the heater side."""
+        if self._client is not None:
+            self._client.drop()
+
+    def deliver(self, handler: Callable[[bytes], None], frame: bytes) -> None:
+        """Pass a frame on after the link delay, unless it is lost."""
+        if self.loss and self._random.random() < self.loss:
+            self.frames_lost += 1
+            return
+        # Never synchronous, BLE traffic always arrives on a later loop pass
+        delay = self.latency + self.jitter * self._random.random()
+        asyncio.get_running_loop().call_later(delay, handler, frame)
+
+    def _send(self, frame: bytes) -> None:
+        """Send a frame to the connected client."""
+        if (client := self._client) is not None:
+            self.frames_sent += 1
+            self.deliver(client.notify, frame)
+
+    def receive(self, data: bytes) -> None:
+        """Handle a command written by the client."""
+        if len(data) < 8 or data[0] != 0xAA or self._client is None:
+            return
+        self.commands_received += 1
+        cmd = data[2]
+        if cmd == CMD_AUTO_UPDATA:
+            self._start_stream(data[4] / 10)
+        elif cmd == CMD_BIND and len(data) >= 12:
+            if data == cached_bind_response(self._mac):
+                self.bound = True
+                self._send(_framed(RESP_BIND_ACCEPTED, 0, 0, 0))
+            else:
+                self._send(_framed(RESP_BIND_REJECTED, 0, 0, 0))
+        elif cmd == CMD_BUTTON:
+            self._press(data[3])
+            self._send(_framed(RESP_CMD_ACK, data[3], data[4], 0))
+        elif cmd == CMD_GET_REG_ADDR:
+            if (value := self.registers.get(data[3])) is not None:
+                self._send(
+                    _framed(RESP_REG_ADDR, data[3], value & 0xFF, value >> 8)
+                )
+        elif cmd == CMD_SHORT_PARA:
+            self._set_para(data[3], data[5])
+            self._send(_framed(RESP_PARA, data[3], 0, data[5]))
+
+    def _start_stream(self, interval: float) -> None:
+        """(Re)start the status broadcast at interval seconds."""
+        self._stream_interval = max(interval, 0.1)
+        if self._stream is None:
+            self._stream = asyncio.get_running_loop().create_task(
+                self._async_stream()
+            )
+
+    async def _async_stream(self) -> None:
+        """Advance the model and broadcast status until disconnected."""
+        while self._client is not None:
+            self._send(self.status_frame())
+            if not self.bound and not self._bind_asked:
+                self._bind_asked = True
+                self._send(_framed(RESP_BIND_REQUEST, 0, 0, 0))
+            await asyncio.sleep(self._stream_interval)
+            self.advance(self._stream_interval)
+            if self.disconnect_rate and self._random.random() < self.disconnect_rate:
+                _LOGGER.debug("Simulated link drop on %s", self.address)
+                self.drop_connection()
+
+    def _press(self, button: int) -> None:
+        """Apply a CMD_BUTTON press to the state machine."""
+        if button == BTN_POWER_ON and self.machine_status == STATE_STANDBY:
+            self._enter(STATE_BOOTING)
+        elif button == BTN_POWER_OFF and self.machine_status == STATE_VENTILATION:
+            self._enter(STATE_STANDBY)
+        elif button == BTN_POWER_OFF and self.machine_status in RUNNING_STATES:
+            self._enter(STATE_RESIDUAL_BURN)
+        elif button == BTN_VENTILATION and self.machine_status == STATE_STANDBY:
+            self._enter(STATE_VENTILATION)
+        elif button == BTN_CLEAR_ERROR and self.machine_status == STATE_ERROR:
+            self.error_code = 0
+            self._enter(STATE_STANDBY)
+
+    def _set_para(self, para: int, value: int) -> None:
+        """Apply a SHORT_PARA write."""
+        if para == PARA_RUN_MODE:
+            self.run_mode = value
+            if self.machine_status in (STATE_AUTO_RUN, STATE_MANUAL_RUN):
+                self._enter(self._run_state())
+        elif para == PARA_TARGET_TEMP:
+            self.target_temp = value
+        elif para == PARA_TARGET_GEAR:
+            self.gear = value
+        elif para in PARA_REGISTERS:
+            self.registers[PARA_REGISTERS[para]] = value
+
+    def fail(self, error_code: int) -> None:
+        """Put the heater into the error state."""
+        self.error_code = error_code
+        self._enter(STATE_ERROR)
+
+    def _run_state(self) -> int:
+        """Return the steady running state for the run mode."""
+        return STATE_MANUAL_RUN if self.run_mode == MODE_MANUAL else STATE_AUTO_RUN
+
+    def _enter(self, state: int) -> None:
+        """Switch machine state, starting its phase timer."""
+        self.machine_status = state
+        self._phase_left = self.phase_durations.get(state, 0.0)
+
+    def advance(self, elapsed: float) -> None:
+        """Run the model forward by elapsed seconds."""
+        if self.machine_status in self.phase_durations:
+            self._phase_left -= elapsed
+            if self._phase_left <= 0:
+                self._enter(
+                    {
+                        STATE_BOOTING: STATE_IGNITING,
+                        STATE_IGNITING: self._run_state(),
+                        STATE_RESIDUAL_BURN: STATE_STANDBY,
+                    }[self.machine_status]
+                )
+
+        burning = self.machine_status in (
+            STATE_IGNITING,
+            STATE_AUTO_RUN,
+            STATE_MANUAL_RUN,
+        )
+        self.pump_freq = 1.0 + 0.5 * self.gear if burning else 0.0
+        self.ignition_power = (
+            80.0 if self.machine_status in (STATE_BOOTING, STATE_IGNITING) else 0.0
+        )
+        self.fan_rpm = (
+            1500 + 300 * self.gear
+            if self.machine_status not in (STATE_STANDBY, STATE_ERROR)
+            else 0
+        )
+        shell_target = 160.0 if burning else self.ambient_temp or 0.0
+        self.shell_temp += (shell_target - self.shell_temp) * min(1.0, elapsed / 60)
+        if self.ambient_temp is not None and burning:
+            self.ambient_temp += (self.target_temp - self.ambient_temp) * min(
+                1.0, elapsed / 600
+            )
+
+    def _run_flags(self) -> int:
+        """Return the run flags byte of the status frame."""
+        burning = self.pump_freq > 0
+        return (
+            (1 if burning else 0)
+            | (4 if self.fan_rpm else 0)
+            | (8 if self.ignition_power else 0)
+            | (self.run_mode & 3) << 5
+        )
+
+    def status_frame(self) -> bytes:
+        """Encode the current state as a 0xFF status broadcast."""
+        values = {
+            "machine_status": self.machine_status,
+            "run_flags": self._run_flags(),
+            "voltage": self.voltage,
+            "altitude": self.altitude,
+            "ambient_temp": self.ambient_temp,
+            "shell_temp": self.shell_temp,
+            "pump_freq": self.pump_freq,
+            "ignition_power": self.ignition_power,
+            "fan_rpm": self.fan_rpm,
+            "error_code": self.error_code,
+            "gear": self.gear,
+            "target_temp": self.target_temp,
+        }
+        raw = []
+        for field in STATUS_FIELDS:
+            value = values[field.name]
+            if value is None:
+                value = SENSOR_NA_VALUE if field.na is None else field.na
+            elif field.scale:
+                value = round(value * field.scale)
+            raw.append(value)
+        frame = bytearray(STATUS_PACKET_MIN_LENGTH)
+        STATUS_STRUCT.pack_into(frame, 0, *raw)
+        frame[0:3] = (0xAA, 0x00, RESP_STATUS)
+        return bytes(frame)
+
+
+class FakeRetryConnector:
+    """Stand-in for bleak-retry-connector's establish_connection.
+
+    Connects to the simulated heater at the device's address. Like the
+    real one it retries failed attempts up to max_attempts, and it
+    charges discovery_time for service discovery unless the heater's
+    services are cached. FakeBleakClient.clear_cache drops them again.
+    """
+
+    def __init__(
+        self,
+        heaters: dict[str, SimulatedHeater],
+        discovery_time: float = DISCOVERY_TIME,
+    ) -> None:
+        self.heaters = heaters
+        self.discovery_time = discovery_time
+        self.client_classes: set[type] = set()
+        self.discoveries = 0
+
+    async def establish_connection(
+        self,
+        client_class: type,
+        device: BLEDevice,
+        name: str,
+        disconnected_callback: Callable[[Any], None] | None = None,
+        max_attempts: int = 4,
+        use_services_cache: bool = True,
+        **kwargs: Any,
+    ) -> FakeBleakClient:
+        """Connect, then discover services when they are not cached."""
+        self.client_classes.add(client_class)
+        heater = self.heaters[device.address]
+        for attempt in range(1, max_attempts + 1):
+            try:
+                client = await heater.async_connect(
+                    device.address, disconnected_callback or (lambda _c: None)
+                )
+            except BleakError:
+                if attempt == max_attempts:
+                    raise
+                continue
+            break
+        if not (use_services_cache and heater.services_cached):
+            await asyncio.sleep(self.discovery_time)
+            self.discoveries += 1
+            heater.services_cached = True
+        return client
+
+    def ble_device(
+        self, _hass: Any, address: str, connectable: bool = True
+    ) -> BLEDevice | None:
+        """Return a BLEDevice for a known heater, like a scanner would."""
+        if address not in self.heaters:
+            return None
+        return BLEDevice(address, "Nordkapp", None, -60)
@@ -0,0 +1,161 @@
+"""Tests for sharing connection slots between heaters."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from bleak.exc import BleakError
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.nordkapp_heater.broker import ConnectionBroker
+from custom_components.nordkapp_heater.const import (
+    DATA_BROKER,
+    DOMAIN,
+    STANDBY_SLICE,
+)
+from custom_components.nordkapp_heater.coordinator import (
+    NordkappHeaterCoordinator,
+)
+
+from .conftest import CONNECT_TIMEOUT, HeaterSetup, heater_address
+from .simulator import SimulatedHeater
+
+ROTATION_SLICE = 0.3  # seconds
+
+
+type StandbySetup = Callable[
+    [ConnectionBroker, int],
+    Awaitable[list[tuple[SimulatedHeater, NordkappHeaterCoordinator]]],
+]
+
+
+@pytest.fixture
+async def standby_heaters(hass: HomeAssistant) -> AsyncGenerator[StandbySetup]:
+    """Return a function that registers unconnected standby heaters.
+
+    Unlike setup_heaters, the broker is given and nothing connects on
+    its own, so there can be more heaters than slots.
+    """
+    pairs: list[tuple[SimulatedHeater, NordkappHeaterCoordinator]] = []
+    unregister: list[Callable[[], None]] = []
+
+    async def _setup(
+        broker: ConnectionBroker, count: int
+    ) -> list[tuple[SimulatedHeater, NordkappHeaterCoordinator]]:
+        for index in range(count):
+            address = heater_address(index)
+            heater = SimulatedHeater(address, seed=index)
+            entry = MockConfigEntry(domain=DOMAIN, data={"address": address})
+            entry.add_to_hass(hass)
+            coordinator = NordkappHeaterCoordinator(
+                hass, address, entry, broker, client_factory=heater.async_connect
+            )
+            unregister.append(broker.async_register(coordinator))
+            pairs.append((heater, coordinator))
+        return pairs
+
+    yield _setup
+
+    for _heater, coordinator in pairs:
+        await coordinator.async_shutdown()
+    for unsub in unregister:
+        unsub()
+
+
+async def test_failed_connect_keeps_slot_of_concurrent_caller(
+    hass: HomeAssistant, setup_heaters: HeaterSetup
+) -> None:
+    """A failed attempt does not release the slot another caller connects on."""
+    [(heater, coordinator)] = await setup_heaters(1)
+    broker = hass.data[DATA_BROKER]
+    heater.drop_connection()
+    assert not coordinator.connected
+    attempts = 0
+
+    async def _flaky(address: str, disconnected_callback: Any) -> Any:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            await asyncio.sleep(0.05)
+            raise BleakError("first attempt fails")
+        return await heater.async_connect(address, disconnected_callback)
+
+    with patch.object(coordinator, "_client_factory", _flaky):
+        await asyncio.gather(coordinator._connect(), coordinator._connect())
+
+    assert attempts == 2
+    assert coordinator.connected
+    assert broker.as_dict()["holders"].keys() == {coordinator.address}
+
+
+async def test_disconnect_releases_slot_after_link_is_down(
+    hass: HomeAssistant, setup_heaters: HeaterSetup
+) -> None:
+    """The slot is handed on only once the client has disconnected."""
+    [(_heater, coordinator)] = await setup_heaters(1)
+    broker = hass.data[DATA_BROKER]
+    client = coordinator._client
+    disconnect = client.disconnect
+    held_during_disconnect = []
+
+    async def _disconnect() -> None:
+        holders = broker.as_dict()["holders"]
+        held_during_disconnect.append(coordinator.address in holders)
+        await disconnect()
+
+    with patch.object(client, "disconnect", _disconnect):
+        await coordinator._disconnect()
+
+    assert held_during_disconnect == [True]
+    assert not broker.as_dict()["holders"]
+
+
+async def test_command_preempts_standby_holder(
+    hass: HomeAssistant, standby_heaters: StandbySetup
+) -> None:
+    """A command on a heater without a slot takes it from a standby one."""
+    broker = ConnectionBroker(hass, 1, STANDBY_SLICE)
+    pairs = await standby_heaters(broker, 2)
+    [(_first, holder), (_second, commanded)] = pairs
+    await holder.async_refresh()
+    assert holder.connected
+    # A holder still writing, like the register reads after bind, keeps it
+    async with asyncio.timeout(CONNECT_TIMEOUT):
+        while not holder.slot_preemptible:
+            await asyncio.sleep(0.02)
+
+    async with asyncio.timeout(CONNECT_TIMEOUT):
+        await commanded.async_power_on()
+
+    assert commanded.connected
+    assert not holder.connected
+    assert broker.preemptions == 1
+    assert broker.as_dict()["holders"].keys() == {commanded.address}
+
+
+async def test_standby_heaters_rotate(
+    hass: HomeAssistant, standby_heaters: StandbySetup
+) -> None:
+    """More standby heaters than slots take turns, one slice each."""
+    broker = ConnectionBroker(hass, 1, ROTATION_SLICE)
+    pairs = await standby_heaters(broker, 3)
+    most_holders = 0
+
+    async with asyncio.timeout(CONNECT_TIMEOUT):
+        connects = [
+            asyncio.create_task(coordinator._connect())
+            for _heater, coordinator in pairs
+        ]
+        while not all(heater.connections for heater, _coordinator in pairs):
+            most_holders = max(most_holders, broker.as_dict()["occupied"])
+            await asyncio.sleep(0.02)
+        await asyncio.gather(*connects)
+
+    assert most_holders == 1
+    assert broker.preemptions >= 2
+    assert sum(coordinator.connected for _heater, coordinator in pairs) == 1
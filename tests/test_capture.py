@@ -0,0 +1,51 @@
+"""Tests for raw frame capture and replay."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.nordkapp_heater.broker import ConnectionBroker
+from custom_components.nordkapp_heater.capture import CAPTURE_SUFFIX, async_replay
+from custom_components.nordkapp_heater.const import (
+    DOMAIN,
+    STANDBY_SLICE,
+    decode_status,
+)
+from custom_components.nordkapp_heater.coordinator import (
+    NordkappHeaterCoordinator,
+)
+
+from .conftest import ADDRESS, HeaterSetup, recorded_frames
+
+
+async def test_capture_replays_to_same_state(
+    hass: HomeAssistant, setup_heaters: HeaterSetup, tmp_path: Path
+) -> None:
+    """A replayed capture leaves a fresh coordinator in the captured state."""
+    [(heater, coordinator)] = await setup_heaters(1)
+    frames = recorded_frames()
+    path = tmp_path / f"run{CAPTURE_SUFFIX}"
+    await coordinator.async_start_capture(path)
+    for frame in frames:
+        heater._client.notify(frame)
+    capture = await coordinator.async_stop_capture()
+    assert capture is not None
+    assert capture.frames >= len(frames)
+
+    entry = MockConfigEntry(domain=DOMAIN, data={"address": ADDRESS})
+    entry.add_to_hass(hass)
+    replica = NordkappHeaterCoordinator(
+        hass, ADDRESS, entry, ConnectionBroker(hass, 1, STANDBY_SLICE)
+    )
+    result = await async_replay(path, replica._handle_notification, speed=None)
+    await replica.async_shutdown()
+
+    assert result["frames"] == capture.frames
+    assert replica.frame_log.total == capture.frames
+    last = decode_status(frames[-1])
+    assert coordinator.data.error_code == last["error_code"]
+    for name in last:
+        assert getattr(replica.data, name) == getattr(coordinator.data, name), name
@@ -0,0 +1,78 @@
+"""Tests for the serialized command writer."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.nordkapp_heater.commands import CommandQueue
+
+ACK_TIMEOUT = 0.2
+
+
+async def test_ack_matches_reply_key(hass: HomeAssistant) -> None:
+    """A reply for an earlier nonce does not acknowledge the current press."""
+    written: list[bytes] = []
+
+    async def _write(packet: bytes) -> None:
+        written.append(packet)
+
+    queue = CommandQueue(hass, _write, 0, ACK_TIMEOUT, 0)
+    press = queue.submit(("button", 1), b"press", ack=("button", 1, 7))
+    while not written:
+        await asyncio.sleep(0)
+
+    assert not queue.acknowledge(("button", 1, 6))
+    assert not press.done()
+    assert queue.acknowledge(("button", 1, 7))
+    await press
+    await queue.async_stop()
+
+
+async def test_unacknowledged_command_does_not_block(hass: HomeAssistant) -> None:
+    """Later commands go out while an earlier one waits for its reply."""
+    written: list[bytes] = []
+
+    async def _write(packet: bytes) -> None:
+        written.append(packet)
+
+    queue = CommandQueue(hass, _write, 0, ACK_TIMEOUT, 1)
+    press = queue.submit(("button", 1), b"press", ack=("button", 1, 7))
+    stream = queue.submit(("stream",), b"stream")
+
+    async with asyncio.timeout(ACK_TIMEOUT / 2):
+        await stream
+    assert written == [b"press", b"stream"]
+    assert not queue.idle
+
+    # Resent once after the timeout, then given up after twice that
+    with pytest.raises(HomeAssistantError):
+        async with asyncio.timeout(ACK_TIMEOUT * 4):
+            await press
+    assert written == [b"press", b"stream", b"press"]
+    assert queue.resent == 1
+    assert queue.unacknowledged == 1
+    assert queue.idle
+    await queue.async_stop()
+
+
+async def test_reply_after_resend(hass: HomeAssistant) -> None:
+    """A reply to the resent packet resolves the command."""
+    written: list[bytes] = []
+
+    async def _write(packet: bytes) -> None:
+        written.append(packet)
+
+    queue = CommandQueue(hass, _write, 0, ACK_TIMEOUT, 2)
+    write = queue.submit(("para", 3), b"para", ack=("para", 3))
+    while len(written) < 2:
+        await asyncio.sleep(0.01)
+
+    assert queue.acknowledge(("para", 3))
+    await write
+    assert queue.ack_latency[("para", 3)].count == 1
+    assert queue.idle
+    await queue.async_stop()
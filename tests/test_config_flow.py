@@ -0,0 +1,53 @@
+"""Tests for the Nordkapp Heater config and options flows."""
+
+from __future__ import annotations
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType, InvalidData
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.nordkapp_heater.const import (
+    CONF_FAST_INTERVAL,
+    CONF_IDLE_TIMEOUT,
+    CONF_RUN_INTERVAL,
+    CONF_SLOW_INTERVAL,
+    DEFAULT_FAST_INTERVAL,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_RUN_INTERVAL,
+    DEFAULT_SLOW_INTERVAL,
+    DOMAIN,
+)
+
+from .conftest import ADDRESS
+
+
+async def test_options_flow_defaults(hass: HomeAssistant) -> None:
+    """The options schema builds and fills every option with its default."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"address": ADDRESS})
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input={}
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["data"][CONF_FAST_INTERVAL] == DEFAULT_FAST_INTERVAL
+    assert result["data"][CONF_RUN_INTERVAL] == DEFAULT_RUN_INTERVAL
+    assert result["data"][CONF_SLOW_INTERVAL] == DEFAULT_SLOW_INTERVAL
+    assert result["data"][CONF_IDLE_TIMEOUT] == DEFAULT_IDLE_TIMEOUT
+
+
+async def test_options_flow_rejects_out_of_range(hass: HomeAssistant) -> None:
+    """Cadence intervals are bounded."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"address": ADDRESS})
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    with pytest.raises(InvalidData):
+        await hass.config_entries.options.async_configure(
+            result["flow_id"], user_input={CONF_SLOW_INTERVAL: 0}
+        )
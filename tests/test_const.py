@@ -0,0 +1,194 @@
+"""Tests and benchmarks for the packet helpers in const.py."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from custom_components.nordkapp_heater.const import (
+    AUTO_UPDATA_COUNT,
+    AUTO_UPDATA_MODE,
+    BTN_CLEAR_ERROR,
+    BTN_POWER_OFF,
+    BTN_POWER_ON,
+    BTN_VENTILATION,
+    CMD_AUTO_UPDATA,
+    CMD_BIND,
+    CMD_BUTTON,
+    CMD_GET_REG_ADDR,
+    CMD_SHORT_PARA,
+    PARA_REGISTERS,
+    PARA_RUN_MODE,
+    PARA_TARGET_GEAR,
+    PARA_TARGET_TEMP,
+    PARA_TEMP_DIFF,
+    PARA_TIMER,
+    SENSOR_NA_VALUE,
+    STATIC_REGISTERS,
+    STATUS_PACKET_MIN_LENGTH,
+    STREAM_INTERVAL_MAX,
+    STREAM_INTERVAL_MIN,
+    build_bind_response,
+    build_cmd,
+    cached_bind_response,
+    cached_cmd,
+    crc16,
+    decode_status,
+)
+from custom_components.nordkapp_heater.coordinator import NordkappHeaterData
+
+from . import legacy
+from .conftest import ADDRESS, recorded_frames
+
+MAC_BYTES = tuple(int(part, 16) for part in ADDRESS.split(":"))
+KEEPALIVE = (CMD_AUTO_UPDATA, AUTO_UPDATA_MODE, 20, AUTO_UPDATA_COUNT)
+
+
+def coordinator_commands() -> list[tuple[int, int, int, int]]:
+    """Return the arguments of every command packet the coordinator sends."""
+    return [
+        *(
+            (CMD_AUTO_UPDATA, AUTO_UPDATA_MODE, interval, AUTO_UPDATA_COUNT)
+            for interval in range(
+                round(STREAM_INTERVAL_MIN * 10), round(STREAM_INTERVAL_MAX * 10) + 1
+            )
+        ),
+        *(
+            (CMD_BUTTON, button, nonce, 0)
+            for button in (
+                BTN_POWER_ON,
+                BTN_POWER_OFF,
+                BTN_CLEAR_ERROR,
+                BTN_VENTILATION,
+            )
+            for nonce in range(255)
+        ),
+        *(
+            (CMD_SHORT_PARA, para, 0, value)
+            for para in (
+                PARA_RUN_MODE,
+                PARA_TARGET_TEMP,
+                PARA_TARGET_GEAR,
+                PARA_TIMER,
+                PARA_TEMP_DIFF,
+            )
+            for value in range(256)
+        ),
+        *(
+            (CMD_GET_REG_ADDR, register, 0, 0)
+            for register in (*STATIC_REGISTERS.values(), *PARA_REGISTERS.values())
+        ),
+    ]
+
+
+def test_commands_match_legacy() -> None:
+    """Table CRC and cached packets are identical to the nibble loop."""
+    for args in coordinator_commands():
+        expected = legacy.build_cmd(*args)
+        assert build_cmd(*args) == expected, args
+        assert cached_cmd(*args) == expected, args
+        assert crc16(expected, 6) == legacy.crc16(expected, 6), args
+        assert crc16(memoryview(expected), 6) == legacy.crc16(expected, 6), args
+
+
+def test_bind_responses_match_legacy() -> None:
+    """Bind responses are identical for any MAC."""
+    rng = random.Random(0)
+    macs = [MAC_BYTES, (0,) * 6, (0xFF,) * 6]
+    macs += [tuple(rng.randrange(256) for _ in range(6)) for _ in range(1000)]
+    for mac in macs:
+        expected = legacy.build_bind_response(mac)
+        assert build_bind_response(mac) == expected, mac
+        assert cached_bind_response(mac) == expected, mac
+        assert crc16(expected, 10) == legacy.crc16(expected, 10), mac
+
+
+def test_crc16_matches_legacy_on_frames() -> None:
+    """CRC over arbitrary lengths of real status frames."""
+    for frame in recorded_frames():
+        for length in range(len(frame) + 1):
+            assert crc16(frame, length) == legacy.crc16(frame, length)
+
+
+def random_frames(count: int) -> list[bytes]:
+    """Return random status frames, some with missing temperature sensors."""
+    rng = random.Random(0)
+    frames = []
+    for i in range(count):
+        frame = bytearray(rng.randbytes(STATUS_PACKET_MIN_LENGTH + 2))
+        if i % 3 == 0:
+            frame[14:16] = SENSOR_NA_VALUE.to_bytes(2, "little")
+        if i % 5 == 0:
+            frame[16:18] = SENSOR_NA_VALUE.to_bytes(2, "little")
+        frames.append(bytes(frame))
+    return frames
+
+
+@pytest.mark.parametrize(
+    "frames",
+    [recorded_frames(), random_frames(5000)],
+    ids=["recorded", "random"],
+)
+def test_decode_status_matches_legacy(frames: list[bytes]) -> None:
+    """Struct decoder gives the same values and types as the le16 parser."""
+    for frame in frames:
+        expected = NordkappHeaterData()
+        legacy.parse_status(expected, frame)
+        for name, value in decode_status(memoryview(frame)).items():
+            legacy_value = getattr(expected, name)
+            assert value == legacy_value, (name, frame.hex())
+            assert type(value) is type(legacy_value), (name, frame.hex())
+
+
+@pytest.mark.benchmark(group="crc16")
+def test_crc16_status_frame(benchmark) -> None:
+    """CRC over a whole 52-byte status frame."""
+    frame = recorded_frames()[0]
+    assert benchmark(crc16, frame, len(frame)) == crc16(bytearray(frame), len(frame))
+
+
+@pytest.mark.benchmark(group="packets")
+def test_build_cmd(benchmark) -> None:
+    """Keepalive, sent on every refresh."""
+    pkt = benchmark(build_cmd, CMD_AUTO_UPDATA, 2, 20, 99)
+    assert pkt[:6] == bytes((0xAA, 0x00, CMD_AUTO_UPDATA, 2, 20, 99))
+    assert pkt[6:] == crc16(pkt, 6).to_bytes(2, "big")
+
+
+@pytest.mark.benchmark(group="packets")
+def test_build_bind_response(benchmark) -> None:
+    """Bind response, sent on every connect."""
+    pkt = benchmark(build_bind_response, MAC_BYTES)
+    assert pkt[:3] == bytes((0xAA, 0x00, CMD_BIND))
+    assert pkt[3:9] == bytes(reversed(MAC_BYTES))
+    assert pkt[10:] == crc16(pkt, 10).to_bytes(2, "big")
+
+
+@pytest.mark.benchmark(group="crc16-keepalive")
+@pytest.mark.parametrize("impl", [legacy.crc16, crc16], ids=["nibble", "table"])
+def test_crc16_keepalive(benchmark, impl) -> None:
+    """CRC of the keepalive header, old nibble loop against the byte table."""
+    pkt = legacy.build_cmd(*KEEPALIVE)
+    assert benchmark(impl, pkt, 6) == int.from_bytes(pkt[6:], "big")
+
+
+@pytest.mark.benchmark(group="keepalive")
+@pytest.mark.parametrize(
+    "impl", [legacy.build_cmd, build_cmd, cached_cmd], ids=["legacy", "built", "cached"]
+)
+def test_keepalive_packet(benchmark, impl) -> None:
+    """Keepalive packet as sent on every refresh, rebuilt or cached."""
+    assert benchmark(impl, *KEEPALIVE) == legacy.build_cmd(*KEEPALIVE)
+
+
+@pytest.mark.benchmark(group="decode")
+@pytest.mark.parametrize("impl", ["legacy", "struct"])
+def test_decode_status(benchmark, impl: str) -> None:
+    """Status frame into NordkappHeaterData, le16 calls against one unpack."""
+    frame = recorded_frames()[60]
+    data = NordkappHeaterData()
+    if impl == "legacy":
+        benchmark(legacy.parse_status, data, frame)
+    else:
+        benchmark(lambda: data.__dict__.update(decode_status(memoryview(frame))))
@@ -0,0 +1,331 @@
+"""Benchmarks for the coordinator hot paths, driven by simulated heaters."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+from collections.abc import Coroutine
+from functools import partial
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from bleak_retry_connector import BleakClientWithServiceCache
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+
+from custom_components.nordkapp_heater.broker import ConnectionBroker
+from custom_components.nordkapp_heater.const import (
+    CMD_AUTO_UPDATA,
+    CMD_BIND,
+    CMD_BUTTON,
+    CMD_SHORT_PARA,
+    CONF_FAST_INTERVAL,
+    CONF_IDLE_DISCONNECT,
+    CONF_IDLE_TIMEOUT,
+    CONF_SLOW_INTERVAL,
+    DOMAIN,
+    FAST_CADENCE_STATES,
+    STANDBY_SLICE,
+    decode_status,
+)
+from custom_components.nordkapp_heater.coordinator import (
+    NordkappHeaterCoordinator,
+)
+
+from . import legacy
+from .conftest import ADDRESS, CONNECT_TIMEOUT, HeaterSetup, recorded_frames
+from .simulator import FakeRetryConnector, SimulatedHeater
+
+STATE_AUTO_RUN = 2
+# Connect rounds are real time, a cold connect waits out the bind delay
+CONNECT_ROUNDS = 5
+
+
+def run_frames() -> list[bytes]:
+    """Return consecutive frames of a running heater, each one changed."""
+    return [
+        frame
+        for frame in recorded_frames()
+        if decode_status(frame)["machine_status"] == STATE_AUTO_RUN
+    ]
+
+
+async def test_sent_packets_match_legacy_crc(setup_heaters: HeaterSetup) -> None:
+    """Every packet written to the heater carries the nibble-loop CRC."""
+    [(heater, coordinator)] = await setup_heaters(1)
+    written: list[bytes] = []
+    receive = heater.receive
+
+    def _receive(data: bytes) -> None:
+        written.append(data)
+        receive(data)
+
+    with patch.object(heater, "receive", _receive):
+        await coordinator.async_power_on()
+        await coordinator.async_set_temperature(24)
+        await coordinator.async_set_timer(3)
+        await coordinator.async_refresh()
+        heater.drop_connection()
+        await coordinator.async_refresh()
+        await coordinator.async_power_off()
+
+    # Register reads may be in there too, depending on timing
+    assert {pkt[2] for pkt in written} >= {
+        CMD_AUTO_UPDATA,
+        CMD_BIND,
+        CMD_BUTTON,
+        CMD_SHORT_PARA,
+    }
+    for pkt in written:
+        assert legacy.crc16(pkt, len(pkt) - 2) == int.from_bytes(pkt[-2:], "big")
+
+
+async def test_publish_latency_counts_status_frames(
+    setup_heaters: HeaterSetup,
+) -> None:
+    """Overlays and parameter replies publish without a latency sample."""
+    [(_heater, coordinator)] = await setup_heaters(1)
+    frames = run_frames()
+    coordinator._handle_notification(0, bytearray(frames[0]))
+    samples = coordinator.publish_latency.count
+
+    coordinator._set_overlay("target_temp", 30)
+    coordinator._publish_status({"timer"})
+    assert coordinator.publish_latency.count == samples
+
+    coordinator._handle_notification(0, bytearray(frames[1]))
+    assert coordinator.publish_latency.count == samples + 1
+
+
+async def test_idle_disconnect_while_publishing(setup_heaters: HeaterSetup) -> None:
+    """Idle standby drops the link even while updates keep being published.
+
+    Every publish used to push the poll back, so the idle check never ran.
+    """
+    [(_heater, coordinator)] = await setup_heaters(
+        1,
+        **{
+            CONF_SLOW_INTERVAL: 1,
+            CONF_IDLE_DISCONNECT: True,
+            CONF_IDLE_TIMEOUT: 1 / 60,
+        },
+    )
+    async with asyncio.timeout(CONNECT_TIMEOUT):
+        while coordinator.connected:
+            coordinator._deliver_status({"voltage"})
+            await asyncio.sleep(0.2)
+    assert coordinator._idle
+
+
+async def test_keepalive_on_cadence_while_publishing(
+    setup_heaters: HeaterSetup,
+) -> None:
+    """Keepalives follow the state cadence, publishes do not delay them."""
+    [(heater, coordinator)] = await setup_heaters(
+        1, **{CONF_SLOW_INTERVAL: 1, CONF_FAST_INTERVAL: 2}
+    )
+    written: list[bytes] = []
+    receive = heater.receive
+
+    def _receive(data: bytes) -> None:
+        written.append(data)
+        receive(data)
+
+    with patch.object(heater, "receive", _receive):
+        for _ in range(13):
+            coordinator._deliver_status({"voltage"})
+            await asyncio.sleep(0.2)
+    assert sum(pkt[2] == CMD_AUTO_UPDATA for pkt in written) >= 2
+
+    # Leaving standby switches to the fast cadence
+    coordinator._data.machine_status = min(FAST_CADENCE_STATES)
+    coordinator._apply_cadence()
+    assert coordinator._tick_interval.total_seconds() == 2
+
+
+@pytest.mark.benchmark(group="parse")
+async def test_parse_status(benchmark, setup_heaters: HeaterSetup) -> None:
+    """Decode and diff a recorded run, state changes included."""
+    [(_heater, coordinator)] = await setup_heaters(1)
+    frames = itertools.cycle(recorded_frames())
+
+    benchmark(lambda: coordinator._parse_status(next(frames)))
+
+    assert coordinator.data.available
+
+
+@pytest.mark.benchmark(group="notification")
+async def test_notification_latency(benchmark, setup_heaters: HeaterSetup) -> None:
+    """Time from a status notification to async_set_updated_data."""
+    [(_heater, coordinator)] = await setup_heaters(1)
+    frames = itertools.cycle(bytearray(frame) for frame in run_frames()[:2])
+    delivered = []
+    before = coordinator.updates_delivered
+
+    with patch.object(coordinator, "async_set_updated_data", delivered.append):
+        benchmark(lambda: coordinator._handle_notification(0, next(frames)))
+
+    assert delivered
+    assert len(delivered) == coordinator.updates_delivered - before
+
+
+@pytest.mark.benchmark(group="fan-out")
+@pytest.mark.parametrize("count", [1, 10, 50])
+async def test_fan_out(
+    benchmark, hass: HomeAssistant, setup_heaters: HeaterSetup, count: int
+) -> None:
+    """One status frame per heater, written through to the entity states."""
+    pairs = await setup_heaters(count)
+    clients = [heater._client for heater, _coordinator in pairs]
+    frames = itertools.cycle(run_frames()[:2])
+
+    def _notify_all() -> None:
+        frame = next(frames)
+        for client in clients:
+            client.notify(frame)
+
+    benchmark(_notify_all)
+
+    # Every heater writes its changed entities to the state machine
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    _notify_all()
+    await hass.async_block_till_done()
+    registry = er.async_get(hass)
+    updated = {
+        registry.async_get(event.data["entity_id"]).config_entry_id
+        for event in events
+    }
+    assert len(updated) == count
+
+
+@pytest.mark.benchmark(group="connect")
+async def test_cold_connect(
+    benchmark, hass: HomeAssistant, fake_retry_connector: FakeRetryConnector
+) -> None:
+    """First connect: new coordinator, unbound heater, nothing cached.
+
+    Goes through _async_establish, which discovers the services, and the
+    heater asks for the bind, answered after BIND_DELAY like the app.
+    """
+    entry = MockConfigEntry(domain=DOMAIN, data={"address": ADDRESS})
+    entry.add_to_hass(hass)
+    broker = ConnectionBroker(hass, 1, STANDBY_SLICE)
+    run = partial(_run_on_loop, hass)
+    coordinators: list[NordkappHeaterCoordinator] = []
+
+    async def _new_coordinator() -> NordkappHeaterCoordinator:
+        fake_retry_connector.heaters[ADDRESS] = SimulatedHeater(ADDRESS)
+        coordinator = NordkappHeaterCoordinator(hass, ADDRESS, entry, broker)
+        coordinators.append(coordinator)
+        return coordinator
+
+    def _setup() -> tuple[tuple[NordkappHeaterCoordinator], dict[str, Any]]:
+        if coordinators:
+            # One heater at a time, free the slot and the address
+            run(coordinators[-1].async_shutdown())
+        return (run(_new_coordinator()),), {}
+
+    def _connect(coordinator: NordkappHeaterCoordinator) -> None:
+        run(coordinator.async_refresh())
+        assert coordinator.connected
+
+    await hass.async_add_executor_job(
+        partial(benchmark.pedantic, _connect, setup=_setup, rounds=CONNECT_ROUNDS)
+    )
+    await coordinators[-1].async_shutdown()
+    assert fake_retry_connector.client_classes == {BleakClientWithServiceCache}
+    assert fake_retry_connector.discoveries == len(coordinators)
+
+
+@pytest.mark.benchmark(group="connect")
+async def test_warm_reconnect(
+    benchmark, hass: HomeAssistant, fake_retry_connector: FakeRetryConnector
+) -> None:
+    """Reconnect after a link drop: bound heater, services cached.
+
+    The coordinator binds right away instead of waiting for the request.
+    """
+    heater = fake_retry_connector.heaters[ADDRESS] = SimulatedHeater(ADDRESS)
+    entry = MockConfigEntry(domain=DOMAIN, data={"address": ADDRESS})
+    entry.add_to_hass(hass)
+    coordinator = NordkappHeaterCoordinator(
+        hass, ADDRESS, entry, ConnectionBroker(hass, 1, STANDBY_SLICE)
+    )
+    await coordinator.async_refresh()
+    assert coordinator.connected
+    run = partial(_run_on_loop, hass)
+
+    async def _drop() -> None:
+        heater.drop_connection()
+
+    def _setup() -> tuple[tuple[()], dict[str, Any]]:
+        run(_drop())
+        assert not coordinator.connected
+        return (), {}
+
+    def _reconnect() -> None:
+        run(coordinator.async_refresh())
+        assert coordinator.connected
+
+    await hass.async_add_executor_job(
+        partial(benchmark.pedantic, _reconnect, setup=_setup, rounds=CONNECT_ROUNDS)
+    )
+    await coordinator.async_shutdown()
+    # Only the first connect discovered the services
+    assert fake_retry_connector.discoveries == 1
+
+
+@pytest.mark.benchmark(group="establish")
+@pytest.mark.parametrize("cached", [False, True], ids=["uncached", "cached"])
+async def test_establish(
+    benchmark,
+    hass: HomeAssistant,
+    fake_retry_connector: FakeRetryConnector,
+    cached: bool,
+) -> None:
+    """_async_establish alone, with and without the service cache."""
+    heater = fake_retry_connector.heaters[ADDRESS] = SimulatedHeater(ADDRESS)
+    heater.services_cached = cached
+    entry = MockConfigEntry(domain=DOMAIN, data={"address": ADDRESS})
+    entry.add_to_hass(hass)
+    coordinator = NordkappHeaterCoordinator(
+        hass, ADDRESS, entry, ConnectionBroker(hass, 1, STANDBY_SLICE)
+    )
+    device = fake_retry_connector.ble_device(hass, ADDRESS)
+    run = partial(_run_on_loop, hass)
+    clients = []
+
+    async def _drop() -> None:
+        heater.drop_connection()
+        heater.services_cached = cached
+
+    def _setup() -> tuple[tuple[()], dict[str, Any]]:
+        run(_drop())
+        return (), {}
+
+    def _establish() -> None:
+        clients.append(
+            run(coordinator._async_establish(device, ADDRESS, lambda _client: None))
+        )
+
+    await hass.async_add_executor_job(
+        partial(benchmark.pedantic, _establish, setup=_setup, rounds=CONNECT_ROUNDS)
+    )
+    heater.drop_connection()
+    assert fake_retry_connector.client_classes == {BleakClientWithServiceCache}
+    assert fake_retry_connector.discoveries == (0 if cached else len(clients))
+
+
+def _run_on_loop(hass: HomeAssistant, coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run a coroutine on the Home Assistant loop from a worker thread.
+
+    pytest-benchmark times synchronous calls, so connect benchmarks run
+    in the executor and hand each round to the loop.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, hass.loop).result()
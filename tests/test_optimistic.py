@@ -0,0 +1,47 @@
+"""Tests for optimistic values shown while a command is in flight."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.nordkapp_heater.const import CMD_SHORT_PARA
+
+from .conftest import CONNECT_TIMEOUT, HeaterSetup
+
+ACK_TIMEOUT = 0.05
+
+
+async def test_overlay_rolled_back_without_ack(setup_heaters: HeaterSetup) -> None:
+    """A parameter the heater never acknowledges falls back to its last value."""
+    [(heater, coordinator)] = await setup_heaters(1)
+    async with asyncio.timeout(CONNECT_TIMEOUT):
+        while coordinator.data.temp_diff is None:
+            await asyncio.sleep(0.05)
+    before = coordinator.data.temp_diff
+    receive = heater.receive
+
+    def _receive(data: bytes) -> None:
+        # The heater misses every parameter write
+        if data[2] != CMD_SHORT_PARA:
+            receive(data)
+
+    with (
+        patch.object(heater, "receive", _receive),
+        patch.object(coordinator._commands, "_ack_timeout", ACK_TIMEOUT),
+    ):
+        task = asyncio.create_task(coordinator.async_set_temp_diff(before + 3))
+        async with asyncio.timeout(CONNECT_TIMEOUT):
+            while coordinator.data.temp_diff == before:
+                await asyncio.sleep(0)
+        assert coordinator.data.temp_diff == before + 3
+
+        with pytest.raises(HomeAssistantError):
+            await task
+
+    assert coordinator.data.temp_diff == before
+    assert not coordinator._overlay
+    assert coordinator._commands.unacknowledged == 1
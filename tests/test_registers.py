@@ -0,0 +1,76 @@
+"""Tests for reading and caching the heater registers."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.nordkapp_heater.const import (
+    PARA_REGISTERS,
+    PARA_TIMER,
+    REGISTER_LAYOUT,
+    STATIC_REGISTERS,
+)
+from custom_components.nordkapp_heater.registers import STORAGE_KEY, RegisterCache
+
+from .conftest import ADDRESS, CONNECT_TIMEOUT, HeaterSetup
+
+CACHED = {ADDRESS: {"firmware_version": 0x0103}}
+
+
+async def test_register_cache_keeps_current_layout(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Values cached under the current layout are loaded."""
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "key": STORAGE_KEY,
+        "data": {"layout": REGISTER_LAYOUT, "heaters": CACHED},
+    }
+    cache = RegisterCache(hass)
+    await cache.async_load()
+    assert cache.get(ADDRESS) == CACHED[ADDRESS]
+
+
+async def test_register_cache_drops_other_layout(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Values cached under an older guess, or before the key, are dropped."""
+    for data in ({"layout": REGISTER_LAYOUT - 1, "heaters": CACHED}, CACHED):
+        hass_storage[STORAGE_KEY] = {"version": 1, "key": STORAGE_KEY, "data": data}
+        cache = RegisterCache(hass)
+        await cache.async_load()
+        assert cache.get(ADDRESS) == {}
+
+
+async def test_implausible_register_reply_dropped(setup_heaters: HeaterSetup) -> None:
+    """A filler reply is left out instead of being cached as a value."""
+    [(heater, coordinator)] = await setup_heaters(1)
+    firmware = STATIC_REGISTERS["firmware_version"]
+    calibration = STATIC_REGISTERS["pump_calibration"]
+    heater.registers[firmware] = 0xFFFF
+
+    values = await coordinator._read_registers([firmware, calibration])
+
+    assert values == {calibration: heater.registers[calibration]}
+
+
+async def test_parameters_read_on_every_connect(setup_heaters: HeaterSetup) -> None:
+    """The parameter mirror follows the heater across reconnects."""
+    [(heater, coordinator)] = await setup_heaters(1)
+    async with asyncio.timeout(CONNECT_TIMEOUT):
+        while coordinator.data.temp_diff is None:
+            await asyncio.sleep(0.05)
+    assert coordinator.data.timer == 0
+    assert coordinator.data.scheduled_start is None
+
+    # Set on the heater itself while the link is down
+    heater.registers[PARA_REGISTERS[PARA_TIMER]] = 5
+    heater.drop_connection()
+    await coordinator.async_refresh()
+    async with asyncio.timeout(CONNECT_TIMEOUT):
+        while coordinator.data.timer != 5:
+            await asyncio.sleep(0.05)
+    assert coordinator.data.scheduled_start is not None
@@ -0,0 +1,99 @@
+"""Tests for the Nordkapp Heater services."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util import dt as dt_util
+
+from custom_components.nordkapp_heater.const import (
+    DOMAIN,
+    PARA_REGISTERS,
+    PARA_TIMER,
+)
+from custom_components.nordkapp_heater.services import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_DELAY,
+    ATTR_START,
+    SERVICE_SCHEDULE_RUN,
+)
+
+from .conftest import HeaterSetup
+
+
+async def schedule_run(
+    hass: HomeAssistant, entry_id: str, **when: Any
+) -> dict[str, Any]:
+    """Call schedule_run, return its response."""
+    return await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SCHEDULE_RUN,
+        {ATTR_CONFIG_ENTRY_ID: entry_id, **when},
+        blocking=True,
+        return_response=True,
+    )
+
+
+@pytest.mark.parametrize(
+    ("field", "ahead", "hours"),
+    [
+        (ATTR_DELAY, timedelta(minutes=89), 1),
+        (ATTR_DELAY, timedelta(hours=2, minutes=31), 3),
+        (ATTR_START, timedelta(hours=5, minutes=1), 5),
+    ],
+    ids=["delay-down", "delay-up", "start"],
+)
+async def test_schedule_run_rounds_to_hours(
+    hass: HomeAssistant,
+    setup_heaters: HeaterSetup,
+    field: str,
+    ahead: timedelta,
+    hours: int,
+) -> None:
+    """The start is rounded to the heater timer's whole hours."""
+    [(heater, coordinator)] = await setup_heaters(1)
+    when = {field: dt_util.now() + ahead if field == ATTR_START else ahead}
+
+    response = await schedule_run(hass, coordinator.entry.entry_id, **when)
+
+    assert response["timer"] == hours
+    assert heater.registers[PARA_REGISTERS[PARA_TIMER]] == hours
+    scheduled = dt_util.parse_datetime(response["scheduled_start"])
+    expected = dt_util.utcnow() + timedelta(hours=hours)
+    assert abs(scheduled - expected) < timedelta(minutes=1)
+
+
+@pytest.mark.parametrize(
+    "when",
+    [{ATTR_DELAY: {"minutes": 20}}, {ATTR_DELAY: {"hours": 25}}],
+    ids=["too-soon", "too-far"],
+)
+async def test_schedule_run_rejects_out_of_range(
+    hass: HomeAssistant, setup_heaters: HeaterSetup, when: dict[str, Any]
+) -> None:
+    """Starts the heater timer cannot express are rejected, not rounded."""
+    [(heater, coordinator)] = await setup_heaters(1)
+
+    with pytest.raises(ServiceValidationError):
+        await schedule_run(hass, coordinator.entry.entry_id, **when)
+    assert heater.registers[PARA_REGISTERS[PARA_TIMER]] == 0
+
+
+async def test_schedule_run_cancel(
+    hass: HomeAssistant, setup_heaters: HeaterSetup
+) -> None:
+    """A zero delay clears a programmed start."""
+    [(heater, coordinator)] = await setup_heaters(1)
+    entry_id = coordinator.entry.entry_id
+    await schedule_run(hass, entry_id, **{ATTR_DELAY: {"hours": 4}})
+    assert coordinator.data.scheduled_start is not None
+
+    response = await schedule_run(hass, entry_id, **{ATTR_DELAY: {"seconds": 0}})
+
+    assert response == {"timer": 0, "scheduled_start": None}
+    assert heater.registers[PARA_REGISTERS[PARA_TIMER]] == 0
+    assert coordinator.data.scheduled_start is None
@@ -0,0 +1,101 @@
+"""Tests for restoring the last known heater state."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.nordkapp_heater.broker import ConnectionBroker
+from custom_components.nordkapp_heater.const import DOMAIN, STANDBY_SLICE
+from custom_components.nordkapp_heater.coordinator import (
+    NordkappHeaterCoordinator,
+)
+from custom_components.nordkapp_heater.snapshots import STORAGE_KEY, SnapshotStore
+
+from .conftest import ADDRESS, recorded_frames
+from .simulator import FakeRetryConnector
+
+
+async def restored_coordinator(
+    hass: HomeAssistant, hass_storage: dict[str, Any], snapshot: dict[str, Any]
+) -> NordkappHeaterCoordinator:
+    """Return a coordinator started from a stored snapshot of the heater."""
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "key": STORAGE_KEY,
+        "data": {ADDRESS: snapshot},
+    }
+    snapshots = SnapshotStore(hass)
+    await snapshots.async_load()
+    entry = MockConfigEntry(domain=DOMAIN, data={"address": ADDRESS})
+    entry.add_to_hass(hass)
+    return NordkappHeaterCoordinator(
+        hass,
+        ADDRESS,
+        entry,
+        ConnectionBroker(hass, 1, STANDBY_SLICE),
+        snapshots=snapshots,
+    )
+
+
+async def test_snapshot_restored_stale(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """The last known state shows as available but stale until a frame."""
+    start = dt_util.utcnow() + timedelta(hours=2)
+    coordinator = await restored_coordinator(
+        hass,
+        hass_storage,
+        {
+            "available": False,
+            "stale": False,
+            "machine_status": 2,
+            "target_temp": 24,
+            "scheduled_start": start.isoformat(),
+        },
+    )
+    data = coordinator._published_data()
+    assert data.available
+    assert data.stale
+    assert (data.machine_status, data.target_temp) == (2, 24)
+    assert data.scheduled_start == start
+
+    coordinator._handle_notification(0, bytearray(recorded_frames()[0]))
+    assert coordinator.data.available
+    assert not coordinator.data.stale
+    await coordinator.async_shutdown()
+
+
+async def test_snapshot_past_schedule_dropped(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """A start that came due while Home Assistant was down is not restored."""
+    start = dt_util.utcnow() - timedelta(minutes=5)
+    coordinator = await restored_coordinator(
+        hass, hass_storage, {"scheduled_start": start.isoformat()}
+    )
+    assert coordinator._published_data().scheduled_start is None
+    await coordinator.async_shutdown()
+
+
+async def test_snapshot_unavailable_after_grace(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    fake_retry_connector: FakeRetryConnector,
+) -> None:
+    """A heater no scanner sees stays available only for the grace period."""
+    coordinator = await restored_coordinator(
+        hass, hass_storage, {"machine_status": 5}
+    )
+    # Nothing advertises, like scanners right after a restart
+    await coordinator._connect()
+    assert coordinator._published_data().available
+
+    coordinator._stale_until = 0.0
+    await coordinator._connect()
+    assert not coordinator._published_data().available
+    await coordinator.async_shutdown()
@@ -0,0 +1,71 @@
+"""Tests for the telemetry ring buffer."""
+
+from __future__ import annotations
+
+import math
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.nordkapp_heater.const import TELEMETRY_SPACING
+from custom_components.nordkapp_heater.telemetry import (
+    TELEMETRY_FIELDS,
+    TelemetryBuffer,
+)
+
+
+def sample(value: float | None) -> SimpleNamespace:
+    """Return status data with every telemetry field set to value."""
+    return SimpleNamespace(**dict.fromkeys(TELEMETRY_FIELDS, value))
+
+
+def test_ring_wraps_around() -> None:
+    """Once full, the oldest samples are overwritten."""
+    buffer = TelemetryBuffer(5)
+    for second in range(8):
+        assert buffer.append(sample(second), now=float(second))
+
+    assert len(buffer) == 5
+    stats = buffer.statistics(60, ["fan_rpm"], now=7.0)
+    assert stats["samples"] == 5
+    assert stats["fan_rpm"] == {"count": 5, "min": 3, "max": 7, "mean": 5}
+
+
+def test_statistics_cover_window() -> None:
+    """Only samples in the window count, missing readings are skipped."""
+    buffer = TelemetryBuffer(100)
+    for second in range(10):
+        buffer.append(sample(None if second == 8 else second), now=float(second))
+
+    stats = buffer.statistics(4.5, ["voltage"], percentiles=[50, 100], now=9.0)
+    assert stats["samples"] == 5
+    # Seconds 5 to 9, second 8 without a reading
+    assert stats["voltage"] == {
+        "count": 4,
+        "min": 5,
+        "max": 9,
+        "mean": 6.75,
+        "p50": 6.5,
+        "p100": 9,
+    }
+    assert buffer.statistics(0.5, ["voltage"], now=20.0) == {
+        "samples": 0,
+        "voltage": None,
+    }
+
+
+@pytest.mark.parametrize(
+    ("interval", "kept"), [(TELEMETRY_SPACING, 1.0), (TELEMETRY_SPACING / 2, 0.5)]
+)
+def test_jittered_stream_on_grid(interval: float, kept: float) -> None:
+    """A stream at the spacing loses no frame to jitter, a faster one half."""
+    rng = random.Random(0)
+    buffer = TelemetryBuffer(1000, TELEMETRY_SPACING)
+    frames = 500
+    now = 0.0
+    for _ in range(frames):
+        now += interval + rng.uniform(-0.2, 0.2) * interval
+        buffer.append(sample(1.0), now=now)
+
+    assert math.isclose(len(buffer) / frames, kept, abs_tol=0.02)
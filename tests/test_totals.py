@@ -0,0 +1,83 @@
+"""Tests for the fuel and burner-hour totalizers."""
+
+from __future__ import annotations
+
+import pytest
+from homeassistant.core import HomeAssistant, State
+from pytest_homeassistant_custom_component.common import (
+    mock_restore_cache_with_extra_data,
+)
+
+from custom_components.nordkapp_heater.const import (
+    DEFAULT_PUMP_STROKE_VOLUME,
+    HEATING_STATES,
+    TOTALIZER_MAX_GAP,
+    decode_status,
+)
+
+from .conftest import HeaterSetup, recorded_frames
+
+FUEL_ENTITY = "sensor.mock_title_fuel_used"
+HOURS_ENTITY = "sensor.mock_title_burner_hours"
+STEP = 10.0  # seconds between frames, within TOTALIZER_MAX_GAP
+STEPS = 4  # longer than a 36 s step of the published burner hours
+ELAPSED = STEPS * STEP
+
+
+def burning_frame() -> bytes:
+    """Return a recorded frame of a heater burning fuel."""
+    for frame in recorded_frames():
+        status = decode_status(frame)
+        if status["machine_status"] in HEATING_STATES and status["pump_freq"]:
+            return frame
+    raise AssertionError("no burning frame recorded")
+
+
+async def test_totals_accumulate(setup_heaters: HeaterSetup) -> None:
+    """Pump strokes add fuel and burning adds hours, gaps add nothing."""
+    [(_heater, coordinator)] = await setup_heaters(1)
+    coordinator._parse_status(burning_frame())
+    data = coordinator.data
+    fuel, hours = data.fuel_used, data.run_hours
+
+    # The first frame after a gap only starts the integration
+    start = coordinator._totals_at + TOTALIZER_MAX_GAP + 1
+    coordinator._accumulate_totals(start, set())
+    assert (data.fuel_used, data.run_hours) == (fuel, hours)
+
+    changed: set[str] = set()
+    for step in range(1, STEPS + 1):
+        coordinator._accumulate_totals(start + step * STEP, changed)
+    strokes = data.pump_freq * ELAPSED
+    assert data.fuel_used == pytest.approx(
+        fuel + strokes * DEFAULT_PUMP_STROKE_VOLUME / 1000
+    )
+    assert data.run_hours == pytest.approx(hours + ELAPSED / 3600)
+    assert changed == {"fuel_used", "run_hours"}
+
+
+async def test_totals_restored(hass: HomeAssistant, setup_heaters: HeaterSetup) -> None:
+    """Totals carry over a restart through the sensors' restore state."""
+    mock_restore_cache_with_extra_data(
+        hass,
+        [
+            (
+                State(FUEL_ENTITY, "12.5"),
+                {"native_value": 12.5, "native_unit_of_measurement": "L"},
+            ),
+            (
+                State(HOURS_ENTITY, "100.25"),
+                {"native_value": 100.25, "native_unit_of_measurement": "h"},
+            ),
+        ],
+    )
+    [(_heater, coordinator)] = await setup_heaters(1)
+
+    # The simulated heater idles in standby, nothing is added on top
+    assert coordinator.data.fuel_used == pytest.approx(12.5)
+    assert coordinator.data.run_hours == pytest.approx(100.25)
+    assert float(hass.states.get(FUEL_ENTITY).state) == pytest.approx(12.5)
+
+    # Restored once, a second restore does not count the total twice
+    coordinator.async_restore_total("fuel_used", 12.5)
+    assert coordinator.data.fuel_used == pytest.approx(12.5)